@@ -1,51 +1,1835 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
 import time
+
+# Start of module import, for the startup timing breakdown
+STARTUP_STARTED = time.perf_counter()
+
+# Only what the main menu needs is imported here; modules for uploads, the
+# database, .docx files, parallel parsing and the test screens are imported
+# where they are used (see --import-audit)
+import tkinter as tk
+from tkinter import ttk, messagebox
 import re
 import json
 import os
-from typing import Dict, List, Optional
+import io
+import logging
+import math
+import struct
+import sys
+from array import array
+import heapq
+import queue
+import threading
+from collections import deque
+from itertools import accumulate
+from collections.abc import Mapping, Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Question headers split the file into blocks, found left to right without
+# overlapping one another, as re.split would.
+QUESTION_HEADER_PATTERN = re.compile(r'\*\*Question (\d+)\*\*')
+
+# The section markers inside a block, in one alternation so each block is
+# tokenized in a single scan. Markers never span a line break, but they can
+# share their "**" ends ("**Feedback**Question text**"), so the whole marker
+# sits in a lookahead and the scan also finds overlapping occurrences. The
+# leading lookahead lets the regex engine skip straight to candidate
+# characters instead of trying every alternative at every position.
+QUESTION_MARKER_PATTERN = re.compile(
+    r'(?=[*QT])'
+    r'(?=(\*\*Question text\*\*)'    # 1: start of the question text
+    r'|(Question \d+Answer)'        # 2: start of the answer options
+    r'|(\*\*Feedback\*\*)'          # 3: start of the feedback
+    r'|(The correct answer is:))'   # 4: correct answer line
+)
+QUESTION_TEXT, ANSWER_SECTION, FEEDBACK, CORRECT_ANSWER = range(1, 5)
+
+OPTION_PATTERN = re.compile(r'([a-d])\\?\.\s*(.*?)(?=\n[a-d]\\?\.|$)', re.DOTALL)
+
+# "b", "b.", "b)", "(b)" or "b\." at the start of a correct answer line
+ANSWER_LABEL_PATTERN = re.compile(r'\(?([a-d])(?:\\?\.|\)|$)\s*')
+# Leading characters of an option used to recognise answers that only quote its start
+ANSWER_PREFIX_LENGTH = 30
+
+# Characters read per chunk when streaming a test file through the parser
+PARSE_CHUNK_SIZE = 1 << 20
+
+# WordprocessingML tags read by the built-in .docx reader
+DOCX_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_BODY = DOCX_NAMESPACE + 'body'
+DOCX_PARAGRAPH = DOCX_NAMESPACE + 'p'
+DOCX_HYPERLINK = DOCX_NAMESPACE + 'hyperlink'
+DOCX_RUN = DOCX_NAMESPACE + 'r'
+DOCX_TEXT = DOCX_NAMESPACE + 't'
+DOCX_TAB = DOCX_NAMESPACE + 'tab'
+DOCX_PTAB = DOCX_NAMESPACE + 'ptab'
+DOCX_BREAK = DOCX_NAMESPACE + 'br'
+DOCX_CARRIAGE_RETURN = DOCX_NAMESPACE + 'cr'
+DOCX_NO_BREAK_HYPHEN = DOCX_NAMESPACE + 'noBreakHyphen'
+DOCX_TYPE = DOCX_NAMESPACE + 'type'
+
+# How often the Tk thread checks for import progress, and how often the
+# import worker reports it
+IMPORT_POLL_INTERVAL_MS = 100
+IMPORT_REPORT_INTERVAL = 0.1
+# How long the import worker waits for the Tk thread to close the mapped bank
+IMPORT_RELEASE_TIMEOUT = 30
+
+# Budget for a cold `import TEST_PREP` in a fresh interpreter, checked by --import-audit
+IMPORT_BUDGET_MS = 150
+
+# How often the Tk thread checks whether saved data has finished loading at startup
+STARTUP_POLL_INTERVAL_MS = 50
+# display_question logs its render latency percentiles once per this many questions
+RENDER_REPORT_INTERVAL = 50
+# The results review adds this many questions at a time as the user scrolls
+RESULTS_PAGE_SIZE = 25
+# Review filters on the results screen: key, button label and the statuses each one shows
+RESULTS_FILTERS = (
+    ('review', "📚 To Review", ('incorrect', 'unanswered')),
+    ('incorrect', "❌ Incorrect", ('incorrect',)),
+    ('unanswered', "⏭️ Unanswered", ('unanswered',)),
+    ('correct', "✅ Correct", ('correct',)),
+    ('all', "All", ('correct', 'incorrect', 'unanswered')),
+)
+# Question navigator grid on the test screen: cells per row and cell pitch in pixels
+NAVIGATOR_COLUMNS = 8
+NAVIGATOR_CELL = 30
+NAVIGATOR_COLORS = {'unanswered': '#d5dbdb', 'correct': '#27ae60', 'incorrect': '#e74c3c',
+                    'flagged': '#f39c12', 'current': '#2c3e50'}
+
+# Set this environment variable to print how long each startup stage took
+STARTUP_TIMING_ENV = "REAL_ESTATE_STARTUP_TIMING"
+
+# Diagnostic logging is off unless this environment variable sets a level for
+# every subsystem ("debug") or for some of them ("persistence=debug,ui=info").
+# Warnings and errors are reported either way.
+LOG_LEVEL_ENV = "REAL_ESTATE_LOG"
+# Log to this file, rotated at LOG_FILE_MAX_BYTES, instead of stderr
+LOG_FILE_ENV = "REAL_ESTATE_LOG_FILE"
+LOG_FILE_MAX_BYTES = 1 << 20
+LOG_FILE_BACKUPS = 3
+LOG_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
+
+# How long the background writer waits for more saves before writing a burst
+PERSIST_DEBOUNCE_SECONDS = 0.5
+# Longest the application waits on exit for queued saves to be written
+PERSIST_EXIT_TIMEOUT = 10.0
+
+# Number of journal events after which the answer journal is folded into its snapshot
+JOURNAL_COMPACT_EVENTS = 5000
+
+# Spaced-repetition review (SM-2): starting ease of a card and the lowest it can fall to
+REVIEW_INITIAL_EASE = 2.5
+REVIEW_MIN_EASE = 1.3
+# A card answered "Again" is due again this many seconds later; within a session it
+# comes back after REVIEW_RELEARN_GAP other cards, or sooner once it is due or nothing else is left
+REVIEW_RELEARN_SECONDS = 60
+REVIEW_RELEARN_GAP = 3
+# Most never-reviewed cards a spaced review session introduces
+REVIEW_NEW_CARDS_PER_SESSION = 20
+# Grades given by the flash card buttons, on SM-2's 0-5 scale
+REVIEW_AGAIN, REVIEW_GOOD, REVIEW_EASY = 1, 4, 5
+
+# Custom exams draw questions in proportion to their smoothed miss rate; a
+# question never answered counts as missed half the time
+CUSTOM_EXAM_DEFAULT_LENGTH = 100
+UNANSWERED_MISS_RATE = 0.5
+# weighted_sample keeps running weight totals per this many questions
+SAMPLE_CHUNK = 256
+
+# Memory-mapped question bank file: header (magic, format version, question
+# count, stamp of the store contents it was written from), then count + 1
+# little-endian offsets into the record area, then one UTF-8 JSON record per question
+BANK_MAGIC = b'QBNK'
+BANK_VERSION = 1
+BANK_HEADER = struct.Struct('<4sHxxQd')
+BANK_OFFSET = struct.Struct('<Q')
+# Banks with at least this many questions also get a memory-mapped copy
+MAPPED_BANK_MIN_QUESTIONS = 5000
+
+# Bump whenever a parser change alters its output, so cached results are not reused
+PARSER_VERSION = 2
+# Upper bound on the total size of the on-disk parse cache
+PARSE_CACHE_MAX_BYTES = 256 << 20
+
+# Files smaller than this are parsed in-process; below it the cost of starting
+# worker processes outweighs what they save
+PARALLEL_PARSE_MIN_SIZE = 4 << 20
+# Approximate amount of question text sent to a worker process at a time
+PARALLEL_BATCH_CHARS = 256 << 10
+
+# One logger per subsystem, all under "real_estate"
+parser_log = logging.getLogger("real_estate.parser")
+persistence_log = logging.getLogger("real_estate.persistence")
+engine_log = logging.getLogger("real_estate.engine")
+ui_log = logging.getLogger("real_estate.ui")
+LOG_SUBSYSTEMS = {'parser': parser_log, 'persistence': persistence_log, 'engine': engine_log, 'ui': ui_log}
+
+
+def configure_logging(spec: str, log_file: Optional[str] = None):
+    """Turn on diagnostic logging from a spec like "debug" or "parser=info,persistence=debug"
+
+    Raises ValueError for an unknown subsystem or level.
+    """
+    app_log = logging.getLogger("real_estate")
+    for part in filter(None, (part.strip() for part in spec.split(','))):
+        subsystem, _, level_name = part.rpartition('=')
+        level = logging.getLevelName(level_name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level in {part!r}")
+        if not subsystem:
+            app_log.setLevel(level)
+        elif subsystem.strip() in LOG_SUBSYSTEMS:
+            LOG_SUBSYSTEMS[subsystem.strip()].setLevel(level)
+        else:
+            raise ValueError(f"Unknown subsystem in {part!r}; expected one of {', '.join(LOG_SUBSYSTEMS)}")
+
+    if log_file:
+        from logging.handlers import RotatingFileHandler
+        handler = RotatingFileHandler(log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS,
+                                      encoding='utf-8')
+    else:
+        handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    app_log.addHandler(handler)
+    app_log.propagate = False
+
+
+def normalize_answer_text(text: str) -> str:
+    """Lowercase and collapse whitespace so answer and option texts compare equal"""
+    return ' '.join(text.lower().split())
+
+
+class AnswerIndex:
+    """Normalized lookup from "The correct answer is:" text to an option letter
+
+    Built once per question. resolve() tries, in order, and returns the first hit:
+
+    1. the whole answer equals an option's text
+    2. the answer is a letter label ("b", "b.", "b)", "(b)"), optionally followed
+       by text, which is then resolved by rules 1 and 3 before falling back to
+       the label's letter
+    3. the answer starts with an option's first ANSWER_PREFIX_LENGTH characters;
+       the longest matching prefix wins
+    4. an option's text appears inside the answer; the longest option wins
+
+    When several options normalize to the same text or prefix, the earliest
+    letter wins.
+    """
+
+    def __init__(self, options: Dict[str, str]):
+        self.options = options
+        self.by_text = {}
+        self.by_prefix = {}
+        for letter, option_text in options.items():
+            normalized = normalize_answer_text(option_text)
+            self.by_text.setdefault(normalized, letter)
+            self.by_prefix.setdefault(normalized[:ANSWER_PREFIX_LENGTH], letter)
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.by_prefix}, reverse=True)
+
+    def _by_prefix(self, answer: str) -> Optional[str]:
+        for length in self.prefix_lengths:
+            letter = self.by_prefix.get(answer[:length])
+            if letter:
+                return letter
+        return None
+
+    def resolve(self, answer_text: str) -> Optional[str]:
+        """Return the option letter the answer refers to, or None"""
+        answer = normalize_answer_text(answer_text)
+        if not answer:
+            return None
+
+        letter = self.by_text.get(answer)
+        if letter:
+            return letter
+
+        label = ANSWER_LABEL_PATTERN.match(answer)
+        if label:
+            rest = answer[label.end():]
+            letter = (self.by_text.get(rest) or self._by_prefix(rest)) if rest else None
+            if letter:
+                return letter
+            if label.group(1) in self.options:
+                return label.group(1)
+
+        letter = self._by_prefix(answer)
+        if letter:
+            return letter
+
+        # Rare: the option is quoted somewhere inside a longer answer
+        for normalized in sorted(self.by_text, key=len, reverse=True):
+            if normalized and normalized in answer:
+                return self.by_text[normalized]
+        return None
+
+
+def count_unresolved_answers(questions: List[Dict]) -> int:
+    """Number of questions whose correct answer is not one of their option letters"""
+    return sum(1 for question in questions if question['correct_answer'] not in question['options'])
+
+
+class Question(Mapping):
+    """One question of the bank, without the overhead of a dict per question
+
+    Fields live in __slots__, the option letters in one string and their texts
+    in a tuple. Option texts and correct answers are interned, so answers that
+    repeat across a bank ("None of the above", "All of the above") are stored
+    once. The app reads the attributes; indexing with the old dict keys
+    (question['options'] and so on) still works, so the save and load paths take
+    questions and plain dicts alike, and to_dict()/from_dict() convert between them.
+    """
+
+    __slots__ = ('id', 'number', 'question', 'letters', 'option_texts', 'correct_answer', 'feedback')
+    FIELDS = ('id', 'number', 'question', 'options', 'correct_answer', 'feedback')
+
+    def __init__(self, number: Optional[int], question: str, options: Dict[str, str], correct_answer: str,
+                 feedback: str, question_id: Optional[str] = None):
+        self.id = question_id
+        self.number = number
+        self.question = question
+        self.options = options
+        self.correct_answer = sys.intern(correct_answer)
+        self.feedback = feedback
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Question':
+        return cls(data['number'], data['question'], data['options'], data['correct_answer'], data['feedback'],
+                   data.get('id'))
+
+    def to_dict(self) -> Dict:
+        return dict(self)
+
+    @property
+    def options(self) -> Dict[str, str]:
+        return dict(zip(self.letters, self.option_texts))
+
+    @options.setter
+    def options(self, options: Dict[str, str]):
+        self.letters = sys.intern(''.join(options))
+        self.option_texts = tuple(sys.intern(option_text) for option_text in options.values())
+
+    def option_text(self, letter: str) -> Optional[str]:
+        """Text of the option with this letter, or None if there is no such option"""
+        for option_letter, option_text in zip(self.letters, self.option_texts):
+            if option_letter == letter:
+                return option_text
+        return None
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS or (key == 'id' and self.id is None):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return (key for key in self.FIELDS if key != 'id' or self.id is not None)
+
+    def __len__(self):
+        return len(self.FIELDS) if self.id is not None else len(self.FIELDS) - 1
+
+    def __repr__(self):
+        return f"Question({self.to_dict()!r})"
+
+
+class QuestionBankParser:
+    """State machine that turns question bank text into question dicts.
+
+    Text is fed in with feed() and finished with close(); both return the
+    questions completed so far. Each question block only records where its
+    sections start and end while it is being scanned, and is sliced apart once
+    the next question header (or the end of the file) is reached.
+    """
+
+    def __init__(self):
+        self.start_block(None)
+
+    def start_block(self, number: Optional[int]):
+        """Begin a new question block whose header has already been consumed"""
+        self._number = number
+        self._pieces = []
+        self._length = 0
+        self._reset_marks()
+
+    def _reset_marks(self):
+        # Offsets inside the current block, mirroring the "first X, then the
+        # first Y after it" lookups the format is defined by
+        self._text_start = None
+        self._text_end = None
+        self._answers_start = None
+        self._answers_end = None
+        self._feedback_start = None
+        self._feedback_end = None
+        self._correct_start = None
+
+    def feed(self, text: str) -> List[Dict]:
+        """Scan a chunk of text and return the questions it completed"""
+        questions = []
+        segment_start = 0
+
+        for header in QUESTION_HEADER_PATTERN.finditer(text):
+            if self._number is not None:
+                self._scan(text, segment_start, header.start())
+                question = self._finish_block()
+                if question:
+                    questions.append(question)
+            self.start_block(int(header.group(1)))
+            segment_start = header.end()
+
+        if self._number is not None:
+            self._scan(text, segment_start, len(text))
+
+        return questions
+
+    def _scan(self, text: str, segment_start: int, segment_end: int):
+        """Record the section markers of text[segment_start:segment_end] and add it to the block
+
+        endpos stops the scan at segment_end, so a marker running into the
+        next header is not seen, just as in the block split off by re.split.
+        """
+        for match in QUESTION_MARKER_PATTERN.finditer(text, segment_start, segment_end):
+            token = match.lastindex
+            start = self._length + match.start() - segment_start
+            end = self._length + match.end(token) - segment_start
+
+            if token == QUESTION_TEXT:
+                if self._text_start is None:
+                    self._text_start = end
+            elif token == ANSWER_SECTION:
+                if self._answers_start is None:
+                    self._answers_start = end
+                if self._text_start is not None and self._text_end is None:
+                    self._text_end = start
+            elif token == FEEDBACK:
+                if self._answers_start is not None and self._answers_end is None:
+                    self._answers_end = start
+                if self._feedback_start is None:
+                    self._feedback_start = end
+            elif token == CORRECT_ANSWER:
+                if self._feedback_start is not None and self._feedback_end is None:
+                    self._feedback_end = start
+                if self._correct_start is None:
+                    self._correct_start = end
+
+        self._pieces.append(text[segment_start:segment_end])
+        self._length += segment_end - segment_start
+
+    def close(self) -> List[Dict]:
+        """Finish the last question block"""
+        question = self._finish_block() if self._number is not None else None
+        self.start_block(None)
+        return [question] if question else []
+
+    def _finish_block(self) -> Optional[Dict]:
+        """Build a question dict from the current block, or None if it is incomplete"""
+        if self._text_start is None or self._text_end is None:
+            return None
+
+        block = ''.join(self._pieces)
+        question_text = ' '.join(block[self._text_start:self._text_end].split())
+
+        # Extract multiple choice options
+        options = {}
+        if self._answers_end is not None:
+            answer_text = block[self._answers_start:self._answers_end]
+            for opt_letter, opt_text in OPTION_PATTERN.findall(answer_text):
+                opt_text = ' '.join(opt_text.split()).replace('\\', '')
+                if opt_text and not opt_text.startswith('**'):
+                    options[opt_letter] = opt_text
+
+        # Extract correct answer (the first non-blank line after the marker)
+        correct_answer = ""
+        if self._correct_start is not None:
+            remainder = block[self._correct_start:]
+            answer_begin = len(remainder) - len(remainder.lstrip())
+            line_end = remainder.find('\n', answer_begin)
+            correct_answer_text = remainder[answer_begin:line_end if line_end != -1 else None].strip()
+
+            # Map the answer text back to an option letter, keeping the raw text
+            # if it can't be resolved (see count_unresolved_answers)
+            correct_letter = AnswerIndex(options).resolve(correct_answer_text)
+            correct_answer = correct_letter if correct_letter else correct_answer_text
+
+        # Extract feedback
+        feedback = ""
+        if self._feedback_end is not None:
+            feedback = ' '.join(block[self._feedback_start:self._feedback_end].split())
+
+        # Only keep the question if it has valid options
+        if len(options) >= 2 and correct_answer:
+            return {
+                'number': self._number,
+                'question': question_text,
+                'options': options,
+                'correct_answer': correct_answer,
+                'feedback': feedback
+            }
+        return None
+
+
+def iter_line_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Regroup text chunks so every piece but the last ends on a line boundary"""
+    pending = ''
+
+    for chunk in chunks:
+        pending += chunk
+        cut = pending.rfind('\n') + 1
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+
+    yield pending
+
+
+def iter_questions(chunks: Iterable[str]) -> Iterator[Dict]:
+    """Yield question dicts from an iterable of text chunks as soon as each one is complete"""
+    parser = QuestionBankParser()
+
+    # Markers never span lines, so only whole lines are handed to the parser
+    for text in iter_line_chunks(chunks):
+        yield from parser.feed(text)
+
+    yield from parser.close()
+
+
+def iter_question_blocks(chunks: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Split streamed text on question headers, yielding (number, block text) pairs"""
+    number = None
+    pieces = []
+
+    for text in iter_line_chunks(chunks):
+        segment_start = 0
+        for match in QUESTION_HEADER_PATTERN.finditer(text):
+            if number is not None:
+                pieces.append(text[segment_start:match.start()])
+                yield number, ''.join(pieces)
+            number = int(match.group(1))
+            pieces = []
+            segment_start = match.end()
+        if number is not None:
+            pieces.append(text[segment_start:])
+
+    if number is not None:
+        yield number, ''.join(pieces)
+
+
+def parse_question_batch(blocks: List[Tuple[int, str]]) -> List[Dict]:
+    """Parse a batch of (number, block text) pairs; runs in worker processes"""
+    parser = QuestionBankParser()
+    questions = []
+
+    for number, block in blocks:
+        parser.start_block(number)
+        questions.extend(parser.feed(block))
+        questions.extend(parser.close())
+
+    return questions
+
+
+def _docx_run_text(run) -> str:
+    """Text of a w:r element, following python-docx's Run.text rules"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == DOCX_TEXT:
+            parts.append(child.text or '')
+        elif tag in (DOCX_TAB, DOCX_PTAB):
+            parts.append('\t')
+        elif tag == DOCX_BREAK:
+            if child.get(DOCX_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag == DOCX_CARRIAGE_RETURN:
+            parts.append('\n')
+        elif tag == DOCX_NO_BREAK_HYPHEN:
+            parts.append('-')
+    return ''.join(parts)
+
+
+def iter_docx_paragraphs(file_path: str,
+                         progress: Optional[Callable[[int, int], None]] = None) -> Iterator[str]:
+    """Yield the text of each top-level paragraph of a .docx file
+
+    word/document.xml is read straight from the zip archive with iterparse, and
+    each body element is discarded as soon as it has been handled, so memory
+    does not grow with the size of the document. Like python-docx's
+    Document.paragraphs, paragraphs inside tables are skipped. progress, if
+    given, is called with (xml_bytes_read, xml_total_bytes).
+    """
+    import zipfile
+    from xml.etree import ElementTree
+
+    with zipfile.ZipFile(file_path) as archive:
+        total_bytes = archive.getinfo('word/document.xml').file_size
+        with archive.open('word/document.xml') as xml_file:
+            depth = 0
+            body = None
+            for event, elem in ElementTree.iterparse(xml_file, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 2 and elem.tag == DOCX_BODY:
+                        body = elem
+                    continue
+
+                depth -= 1
+                if depth != 2 or body is None:
+                    continue
+
+                # A direct child of w:body has been fully read
+                if elem.tag == DOCX_PARAGRAPH:
+                    parts = []
+                    for child in elem:
+                        if child.tag == DOCX_RUN:
+                            parts.append(_docx_run_text(child))
+                        elif child.tag == DOCX_HYPERLINK:
+                            parts.extend(_docx_run_text(run) for run in child if run.tag == DOCX_RUN)
+                    yield ''.join(parts)
+                    if progress:
+                        progress(xml_file.tell(), total_bytes)
+                elem.clear()
+                body.remove(elem)
+
+
+def iter_question_docx(file_path: str, chunk_size: int = PARSE_CHUNK_SIZE,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       parallel: Optional[bool] = None) -> Iterator[Dict]:
+    """Stream questions from a .docx file, one paragraph per line
+
+    parallel=None decides with should_parse_in_parallel() on the size of the
+    document XML.
+    """
+    import zipfile
+
+    if parallel is None:
+        with zipfile.ZipFile(file_path) as archive:
+            parallel = should_parse_in_parallel(archive.getinfo('word/document.xml').file_size)
+
+    def read_chunks():
+        # Join paragraphs with newlines and hand them on in chunk_size batches
+        lines = []
+        size = 0
+        for paragraph in iter_docx_paragraphs(file_path, progress):
+            lines.append(paragraph)
+            size += len(paragraph) + 1
+            if size >= chunk_size:
+                lines.append('')
+                yield '\n'.join(lines)
+                lines = []
+                size = 0
+        yield '\n'.join(lines)
+
+    if parallel:
+        yield from iter_questions_parallel(read_chunks())
+    else:
+        yield from iter_questions(read_chunks())
+
+
+def should_parse_in_parallel(size: int) -> bool:
+    """Whether input of the given size is worth parsing in worker processes"""
+    return size >= PARALLEL_PARSE_MIN_SIZE and (os.cpu_count() or 1) > 1
+
+
+def iter_questions_parallel(chunks: Iterable[str], workers: Optional[int] = None) -> Iterator[Dict]:
+    """Parse question blocks in a process pool, yielding questions in file order
+
+    Blocks are grouped into batches of about PARALLEL_BATCH_CHARS characters and
+    only a few batches per worker are kept in flight, so memory stays bounded.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = deque()
+
+    def batches():
+        batch = []
+        batch_chars = 0
+        for number, block in iter_question_blocks(chunks):
+            batch.append((number, block))
+            batch_chars += len(block)
+            if batch_chars >= PARALLEL_BATCH_CHARS:
+                yield batch
+                batch = []
+                batch_chars = 0
+        if batch:
+            yield batch
+
+    try:
+        for batch in batches():
+            in_flight.append(executor.submit(parse_question_batch, batch))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        # Don't wait for queued batches if the caller stopped early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_question_file(file_path: str, chunk_size: int = PARSE_CHUNK_SIZE,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       parallel: Optional[bool] = None) -> Iterator[Dict]:
+    """Stream questions from a text file without reading it into memory at once
+
+    progress, if given, is called after every chunk with (bytes_read, total_bytes).
+    parallel=None decides with should_parse_in_parallel().
+    """
+    total_bytes = os.path.getsize(file_path)
+    if parallel is None:
+        parallel = should_parse_in_parallel(total_bytes)
+
+    with open(file_path, 'rb') as raw_file:
+        # Same decoding and newline handling as open(file_path, 'r', ...)
+        text_file = io.TextIOWrapper(raw_file, encoding='utf-8', errors='ignore')
+
+        def read_chunks():
+            while True:
+                chunk = text_file.read(chunk_size)
+                if not chunk:
+                    break
+                if progress:
+                    progress(raw_file.tell(), total_bytes)
+                yield chunk
+
+        if parallel:
+            yield from iter_questions_parallel(read_chunks())
+        else:
+            yield from iter_questions(read_chunks())
+
+
+def parse_questions(file_content: str, parallel: Optional[bool] = None) -> List[Dict]:
+    """Parse question bank text into a list of question dicts
+
+    parallel=None decides with should_parse_in_parallel().
+    """
+    if parallel is None:
+        parallel = should_parse_in_parallel(len(file_content))
+    if parallel:
+        return list(iter_questions_parallel([file_content]))
+    return list(iter_questions([file_content]))
+
+
+def write_json_atomic(path: str, data):
+    """Write data as compact JSON so the file is either the old or the new version, never half of each"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=Question.to_dict)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class PersistenceWriter:
+    """Background thread that runs persistence writes off the Tk thread
+
+    Callers submit(key, job) with a zero-argument callable. Writes are held for
+    a short debounce window so bursts coalesce: a job submitted under a key
+    that is already pending replaces the pending one, and jobs run in the
+    order their keys were first submitted. flush() blocks until everything
+    queued has been written and is the hook to call before exiting.
+    """
+
+    def __init__(self, debounce: float = PERSIST_DEBOUNCE_SECONDS):
+        self.debounce = debounce
+        self.condition = threading.Condition()
+        self.pending = {}
+        self.busy = False
+        self.flushing = 0
+        self.stopped = False
+
+        # Write-latency metrics
+        self.latencies = deque(maxlen=1000)
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+
+        self.thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, key: str, job: Callable[[], None]):
+        """Queue job, replacing any job still pending under the same key"""
+        with self.condition:
+            if key in self.pending:
+                self.coalesced += 1
+            self.pending[key] = job
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+                if not self.pending:
+                    return
 
+                # Let a burst of submissions settle unless someone is waiting on a flush
+                deadline = time.monotonic() + self.debounce
+                while not self.flushing and not self.stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                jobs = list(self.pending.values())
+                self.pending.clear()
+                self.busy = True
+
+            for job in jobs:
+                start = time.perf_counter()
+                try:
+                    job()
+                except Exception as e:
+                    self.errors += 1
+                    persistence_log.error("Error in background write: %s", e)
+                self.latencies.append(time.perf_counter() - start)
+                self.writes += 1
+
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued now and wait for it; returns False on timeout"""
+        if threading.current_thread() is self.thread:
+            return False
+        with self.condition:
+            self.flushing += 1
+            self.condition.notify_all()
+            try:
+                return self.condition.wait_for(lambda: not self.pending and not self.busy, timeout)
+            finally:
+                self.flushing -= 1
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flush and stop the writer thread"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+
+    def metrics(self) -> Dict:
+        """Write counts and latencies (in milliseconds) of the most recent writes"""
+        latencies = sorted(self.latencies)
+        with self.condition:
+            pending = len(self.pending)
+        return {
+            'writes': self.writes,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'pending': pending,
+            'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            'p95_ms': latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)] * 1000 if latencies else 0.0,
+            'max_ms': latencies[-1] * 1000 if latencies else 0.0
+        }
+
+
+class ParseCache:
+    """On-disk cache of parsed questions keyed by file content hash and parser version
+
+    Entries are compact JSON files named after their key. Every hit refreshes
+    the entry's modification time, and the least recently used entries are
+    removed once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key_for_file(self, file_path: str) -> str:
+        """Hash the file contents together with the parser version and reader used"""
+        import hashlib
+
+        digest = hashlib.sha256()
+        digest.update(f"parser-{PARSER_VERSION}:{os.path.splitext(file_path)[1].lower()}:".encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return the cached questions for key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                questions = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            questions = None
+        except (OSError, ValueError):
+            # Unreadable entry, drop it and parse again
+            self._remove(path)
+            questions = None
+
+        if questions is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return questions
+
+    def put(self, key: str, questions: List[Dict]):
+        """Store parsed questions under key and evict old entries if needed"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key)
+        write_json_atomic(path, questions)
+        self._evict(keep=path)
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                total_size -= size
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every cache entry"""
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    def stats(self) -> Dict:
+        """Hit/miss counts for this session"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def question_content_id(question: Dict) -> str:
+    """Stable ID derived from a question's text, options and answer (not its number)"""
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=8)
+    parts = [question['question'], question['correct_answer']]
+    for letter, option_text in question['options'].items():
+        parts.append(letter)
+        parts.append(option_text)
+    digest.update('\x1f'.join(parts).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def assign_question_ids(questions: List[Dict]):
+    """Give every question an 'id'; repeated identical questions get a -2, -3... suffix"""
+    seen = {}
+    for question in questions:
+        question_id = question_content_id(question)
+        occurrence = seen.get(question_id, 0) + 1
+        seen[question_id] = occurrence
+        question['id'] = question_id if occurrence == 1 else f"{question_id}-{occurrence}"
+
+
+class QuestionStore:
+    """SQLite storage for the question bank
+
+    Questions and their options live in separate tables keyed by the stable
+    question ID, with the bank order kept in a unique position column, so the
+    bank can be counted or read one question at a time without loading it all.
+    The database runs in WAL mode. Writes may come from the import worker
+    thread, so the connection is shared under a lock.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS questions (
+            question_id TEXT PRIMARY KEY,
+            position INTEGER NOT NULL UNIQUE,
+            number INTEGER,
+            question TEXT NOT NULL,
+            correct_answer TEXT NOT NULL,
+            feedback TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS options (
+            question_id TEXT NOT NULL REFERENCES questions(question_id) ON DELETE CASCADE,
+            ordinal INTEGER NOT NULL,
+            letter TEXT NOT NULL,
+            text TEXT NOT NULL,
+            PRIMARY KEY (question_id, ordinal)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    QUESTION_COLUMNS = """
+        SELECT q.question_id, q.number, q.question, q.correct_answer, q.feedback, o.letter, o.text
+        FROM questions q LEFT JOIN options o ON o.question_id = q.question_id
+    """
+
+    def __init__(self, db_path: str):
+        import sqlite3
+
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        with self.lock, self.connection:
+            self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def question_count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def get_setting(self, key: str, default=None):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_setting(self, key: str, value):
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                    (key, json.dumps(value)))
+
+    @staticmethod
+    def _rows_to_questions(rows) -> Iterator[Dict]:
+        """Group joined question/option rows (ordered by question) into Questions"""
+        current = None
+        options = {}
+        for row in rows:
+            if current is None or current[0] != row[0]:
+                if current is not None:
+                    yield Question(current[1], current[2], options, current[3], current[4], current[0])
+                current = row
+                options = {}
+            if row[5] is not None:
+                options[row[5]] = row[6]
+        if current is not None:
+            yield Question(current[1], current[2], options, current[3], current[4], current[0])
+
+    def get_question(self, position: int) -> Question:
+        """Question at the given position in the bank"""
+        with self.lock:
+            rows = self.connection.execute(
+                self.QUESTION_COLUMNS + " WHERE q.position = ? ORDER BY o.ordinal", (position,)).fetchall()
+        if not rows:
+            raise IndexError(position)
+        return next(self._rows_to_questions(rows))
+
+    def question_ids(self) -> List[str]:
+        """Stable IDs of every question, in bank order"""
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT question_id FROM questions ORDER BY position")]
+
+    def positions_by_id(self, question_ids: List[str]) -> Dict[str, int]:
+        """Bank positions of the given IDs; unknown IDs are left out"""
+        positions = {}
+        with self.lock:
+            for start in range(0, len(question_ids), 500):
+                batch = question_ids[start:start + 500]
+                positions.update(self.connection.execute(
+                    f"SELECT question_id, position FROM questions WHERE question_id IN ({','.join('?' * len(batch))})",
+                    batch))
+        return positions
+
+    def get_questions_by_id(self, question_ids: List[str]) -> List[Question]:
+        """Questions with the given IDs, in the order given; unknown IDs are skipped"""
+        found = {}
+        with self.lock:
+            for start in range(0, len(question_ids), 500):
+                batch = question_ids[start:start + 500]
+                rows = self.connection.execute(
+                    self.QUESTION_COLUMNS +
+                    f" WHERE q.question_id IN ({','.join('?' * len(batch))}) ORDER BY q.position, o.ordinal",
+                    batch)
+                for question in self._rows_to_questions(rows):
+                    found[question.id] = question
+        return [found[question_id] for question_id in question_ids if question_id in found]
+
+    def load_questions(self) -> List[Question]:
+        """Every question in bank order"""
+        with self.lock:
+            rows = self.connection.execute(self.QUESTION_COLUMNS + " ORDER BY q.position, o.ordinal")
+            return list(self._rows_to_questions(rows))
+
+    def replace_questions(self, questions: List[Dict], test_file_loaded: bool) -> float:
+        """Replace the whole bank in a single transaction; returns the new contents' timestamp"""
+        if any('id' not in question for question in questions):
+            assign_question_ids(questions)
+
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM options")
+            self.connection.execute("DELETE FROM questions")
+            self.connection.executemany(
+                "INSERT INTO questions (question_id, position, number, question, correct_answer, feedback) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((q['id'], position, q['number'], q['question'], q['correct_answer'], q['feedback'])
+                 for position, q in enumerate(questions)))
+            self.connection.executemany(
+                "INSERT INTO options (question_id, ordinal, letter, text) VALUES (?, ?, ?, ?)",
+                ((q['id'], ordinal, letter, option_text)
+                 for q in questions
+                 for ordinal, (letter, option_text) in enumerate(q['options'].items())))
+            self.connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                    ('test_file_loaded', json.dumps(test_file_loaded)))
+            stamp = time.time()
+            self.connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                    ('timestamp', json.dumps(stamp)))
+        return stamp
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM options")
+            self.connection.execute("DELETE FROM questions")
+            self.connection.execute("DELETE FROM settings")
+
+    def migrate_json(self, json_path: str) -> bool:
+        """Import a saved_test_data.json file left by older versions, then set it aside
+
+        Returns True if a file was migrated.
+        """
+        if not os.path.exists(json_path):
+            return False
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        questions = data.get('questions', [])
+        self.replace_questions(questions, data.get('test_file_loaded', False))
+        os.replace(json_path, json_path + ".migrated")
+        return True
+
+
+class StoredQuestionList(Sequence):
+    """Read-only list view of the questions in a QuestionStore
+
+    len() is a COUNT query and indexing reads a single question, so nothing is
+    loaded until a test actually needs the whole bank (copy() or iteration).
+    """
+
+    def __init__(self, store: QuestionStore):
+        self.store = store
+        self._count = store.question_count()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self.store.get_question(index)
+
+    def __iter__(self):
+        return iter(self.store.load_questions())
+
+    def copy(self) -> List[Question]:
+        return self.store.load_questions()
+
+
+def write_question_bank(bank_path: str, questions: Iterable[Dict], count: int, stamp: float = 0.0):
+    """Write questions to a memory-mappable bank file, replacing it atomically
+
+    Records are streamed to disk; only the offset table is held in memory.
+    """
+    offsets = array('Q', [0])
+    table_start = BANK_HEADER.size
+    data_start = table_start + (count + 1) * BANK_OFFSET.size
+
+    temp_path = bank_path + ".tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.seek(data_start)
+            for question in questions:
+                record = json.dumps(question, ensure_ascii=False, separators=(',', ':'),
+                                    default=Question.to_dict).encode('utf-8')
+                f.write(record)
+                offsets.append(offsets[-1] + len(record))
+            if len(offsets) != count + 1:
+                raise ValueError(f"Expected {count} questions, got {len(offsets) - 1}")
+
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+            f.seek(0)
+            f.write(BANK_HEADER.pack(BANK_MAGIC, BANK_VERSION, count, stamp))
+            f.write(offsets.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, bank_path)
+    except BaseException:
+        # Don't leave a partial copy behind; the old bank file, if any, is untouched
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def convert_json_to_bank(json_path: str, bank_path: str, stamp: float = 0.0) -> int:
+    """Convert a saved_test_data.json file into a bank file; returns the question count
+
+    Pass the stamp of the store holding the same questions so the bank is
+    recognised as current.
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f).get('questions', [])
+    if any('id' not in question for question in questions):
+        assign_question_ids(questions)
+    write_question_bank(bank_path, questions, len(questions), stamp)
+    return len(questions)
+
+
+class MappedQuestionList(Sequence):
+    """Read-only list view of a memory-mapped bank file
+
+    Indexing decodes a single record straight from the mapping, so question i
+    costs the same whatever the bank size and only the questions being shown
+    are ever turned into dicts.
+    """
+
+    def __init__(self, bank_path: str):
+        import mmap
+
+        self.bank_path = bank_path
+        with open(bank_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self._count, self.stamp = BANK_HEADER.unpack_from(self._map, 0)
+            if magic != BANK_MAGIC or version != BANK_VERSION:
+                raise ValueError(f"{bank_path} is not a version {BANK_VERSION} question bank")
+            self._table_start = BANK_HEADER.size
+            self._data_start = self._table_start + (self._count + 1) * BANK_OFFSET.size
+            if self._data_start + self._offset(self._count) > len(self._map):
+                raise ValueError(f"{bank_path} is truncated")
+        except Exception:
+            self._map.close()
+            raise
+
+    def _offset(self, index: int) -> int:
+        return BANK_OFFSET.unpack_from(self._map, self._table_start + index * BANK_OFFSET.size)[0]
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start = self._data_start + self._offset(index)
+        end = self._data_start + self._offset(index + 1)
+        return Question.from_dict(json.loads(self._map[start:end].decode('utf-8')))
+
+    def copy(self) -> List[Question]:
+        return list(self)
+
+
+class QuestionSetView(Sequence):
+    """Read-only view of some of a bank's questions, in a chosen order
+
+    Holds the bank and an array of positions into it, so a test or a deck of
+    flash cards over any subset of the bank, shuffled or not, costs one small
+    int per question instead of a copy of the list or of each question.
+    """
+
+    def __init__(self, bank: Sequence, positions: Optional[Iterable[int]] = None):
+        self.bank = bank
+        self.positions = array('I', range(len(bank)) if positions is None else positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return QuestionSetView(self.bank, self.positions[index])
+        return self.bank[self.positions[index]]
+
+    def subset(self, indexes: Iterable[int]) -> 'QuestionSetView':
+        """A view of the questions at the given indexes of this view, in that order"""
+        positions = self.positions
+        return QuestionSetView(self.bank, (positions[index] for index in indexes))
+
+    def shuffled(self) -> 'QuestionSetView':
+        """The same questions in a random order"""
+        import random
+
+        positions = array('I', self.positions)
+        random.shuffle(positions)
+        return QuestionSetView(self.bank, positions)
+
+
+def miss_rate_weights(size: int, positions: Dict[str, int], stats: Dict[str, List]) -> List[float]:
+    """Sampling weight of each of size questions: its miss rate smoothed as (misses + 1) / (attempts + 2)
+
+    positions maps stable question IDs to indexes and stats is
+    AnswerJournal.stats. Only questions with a history are visited; the rest
+    keep UNANSWERED_MISS_RATE.
+    """
+    weights = [UNANSWERED_MISS_RATE] * size
+    for question_id, (attempts, misses, _) in stats.items():
+        index = positions.get(question_id)
+        if index is not None:
+            weights[index] = (misses + 1) / (attempts + 2)
+    return weights
+
+
+def weighted_sample(weights: Sequence[float], k: int, seed: Optional[int] = None) -> List[int]:
+    """Indexes of k items drawn without replacement, each in proportion to its weight
+
+    Efraimidis-Spirakis A-Res with exponential jumps (A-ExpJ): each item gets the
+    key u ** (1 / weight) and the k largest keys win, but instead of drawing a
+    key for every item the reservoir jumps straight to the next item that would
+    enter it, so only about k * log(n / k) items are looked at in Python.
+    Jumps are found by bisecting running weight totals, kept per
+    SAMPLE_CHUNK items and worked out within a chunk only when a jump lands
+    in it. Weights must be positive. The result is in descending key order,
+    which is itself a weighted random order, and is the same for the same
+    weights and seed.
+    """
+    import bisect
+    import random
+
+    rng = random.Random(seed)
+    n = len(weights)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    # 1 - random() is in (0, 1], so no key or logarithm below is ever of zero
+    reservoir = [((1.0 - rng.random()) ** (1 / weights[index]), index) for index in range(k)]
+    heapq.heapify(reservoir)
+
+    chunk_totals = list(accumulate(sum(weights[start:start + SAMPLE_CHUNK]) for start in range(0, n, SAMPLE_CHUNK)))
+    loaded_chunk = -1
+    running = []  # Totals through each item of loaded_chunk, after the total of the chunks before it
+
+    def load_chunk(chunk):
+        nonlocal loaded_chunk, running
+        if chunk != loaded_chunk:
+            start = chunk * SAMPLE_CHUNK
+            running = list(accumulate(weights[start:start + SAMPLE_CHUNK],
+                                      initial=chunk_totals[chunk - 1] if chunk else 0.0))
+            loaded_chunk = chunk
+
+    position = k
+    while position < n:
+        threshold = reservoir[0][0]
+        if threshold >= 1.0:
+            break  # No key can beat it
+
+        # Total weight to skip, from the end of the previous item, before the next item enters the reservoir
+        jump = math.log(1.0 - rng.random()) / math.log(threshold)
+        load_chunk((position - 1) // SAMPLE_CHUNK)
+        target = running[(position - 1) % SAMPLE_CHUNK + 1] + jump
+
+        chunk = bisect.bisect_left(chunk_totals, target)
+        if chunk >= len(chunk_totals):
+            break
+        load_chunk(chunk)
+        offset = min(bisect.bisect_left(running, target, 1), len(running) - 1) - 1
+        position = max(position, chunk * SAMPLE_CHUNK + offset)
+        if position >= n:
+            break
+
+        weight = weights[position]
+        lowest = threshold ** weight
+        key = rng.uniform(lowest, 1) ** (1 / weight)
+        heapq.heapreplace(reservoir, (key, position))
+        position += 1
+
+    return [index for _, index in sorted(reservoir, reverse=True)]
+
+
+class AnswerJournal:
+    """Append-only log of answer events, folded into a snapshot from time to time
+
+    Every answer becomes one JSON line in the journal, and every submitted
+    test appends the IDs of the questions it got wrong. The current
+    wrong-question set is the one from the latest submit. Per-question history
+    (attempts, misses, last answered) is kept for every question ever answered;
+    changing an answer within a test revises that attempt rather than adding one.
+
+    State is updated immediately; the file writes go through a
+    PersistenceWriter when one is given, so bursts of answers are appended in
+    one go off the Tk thread. Events carry an increasing sequence number and
+    the snapshot records the last one it includes, so a crash between writing
+    the snapshot and truncating the journal never counts an event twice.
+    """
+
+    def __init__(self, journal_path: str, snapshot_path: str, writer: Optional[PersistenceWriter] = None):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.writer = writer
+        self.lock = threading.RLock()
+        self.wrong_ids = []
+        self.stats = {}  # question ID -> [attempts, misses, last answered timestamp]
+        self.sequence = 0
+        self.journal_events = 0
+        self._pending_lines = []
+        self._journal_file = None
+
+    def load(self):
+        """Rebuild the current state from the snapshot plus the journal"""
+        with self.lock:
+            self.wrong_ids = []
+            self.stats = {}
+            self.sequence = 0
+            self.journal_events = 0
+
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                self.sequence = snapshot.get('events', 0)
+                self.wrong_ids = snapshot.get('wrong_ids', [])
+                self.stats = snapshot.get('stats', {})
+
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            event = json.loads(line)
+                        except ValueError:
+                            continue  # Partly written line from a crash
+                        if event.get('seq', 0) <= self.sequence:
+                            continue  # Already folded into the snapshot
+                        self._apply(event)
+                        self.sequence = event['seq']
+                        self.journal_events += 1
+
+            if self.journal_events >= JOURNAL_COMPACT_EVENTS:
+                self._schedule('journal-compact', self.compact)
+
+    def _apply(self, event: Dict):
+        if event.get('type') == 'answer':
+            entry = self.stats.setdefault(event['id'], [0, 0, 0.0])
+            if 'was_correct' in event:
+                # A changed answer: undo the miss of the answer it replaces, if any
+                entry[0] = max(entry[0], 1)
+                entry[1] = max(entry[1] - (not event['was_correct']), 0)
+            else:
+                entry[0] += 1
+            if not event['correct']:
+                entry[1] += 1
+            entry[2] = event['t']
+        elif event.get('type') == 'submit':
+            self.wrong_ids = event['wrong']
+
+    def _schedule(self, key: str, job: Callable[[], None]):
+        if self.writer:
+            self.writer.submit(key, job)
+        else:
+            job()
+
+    def _append(self, event: Dict):
+        with self.lock:
+            self.sequence += 1
+            event['seq'] = self.sequence
+            event['t'] = time.time()
+            self._apply(event)
+            self._pending_lines.append(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+            self.journal_events += 1
+        self._schedule('journal-append', self.write_pending)
+
+    def write_pending(self):
+        """Append every queued event line to the journal file"""
+        with self.lock:
+            lines = self._pending_lines
+            self._pending_lines = []
+            if not lines:
+                return
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_file.write(''.join(lines))
+            self._journal_file.flush()
+
+    def record_answer(self, question_id: str, choice: str, correct: bool, was_correct: Optional[bool] = None):
+        """Append one answer event
+
+        Pass was_correct when this changes an earlier answer in the same test,
+        so it is counted as the same attempt.
+        """
+        event = {'type': 'answer', 'id': question_id, 'choice': choice, 'correct': correct}
+        if was_correct is not None:
+            event['was_correct'] = was_correct
+        self._append(event)
+
+    def record_submit(self, wrong_ids: List[str]):
+        """Append the wrong-question set of a submitted test, compacting if the journal is long"""
+        self._append({'type': 'submit', 'wrong': list(wrong_ids)})
+        if self.journal_events >= JOURNAL_COMPACT_EVENTS:
+            self._schedule('journal-compact', self.compact)
+
+    def compact(self):
+        """Fold the journal into the snapshot and start an empty journal"""
+        with self.lock:
+            self.write_pending()
+            snapshot = {
+                'events': self.sequence,
+                'wrong_ids': list(self.wrong_ids),
+                'stats': self.stats,
+                'timestamp': time.time()
+            }
+            write_json_atomic(self.snapshot_path, snapshot)
+            self.close()
+            open(self.journal_path, 'w', encoding='utf-8').close()
+            self.journal_events = 0
+
+    def close(self):
+        with self.lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+
+    def clear(self):
+        """Forget all progress and history"""
+        with self.lock:
+            self.close()
+            for path in (self.journal_path, self.snapshot_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.wrong_ids = []
+            self.stats = {}
+            self.sequence = 0
+            self.journal_events = 0
+            self._pending_lines = []
+
+    def migrate_json(self, progress_path: str) -> bool:
+        """Turn a saved_progress.json left by older versions into a submit event
+
+        Returns True if a file was migrated.
+        """
+        if (not os.path.exists(progress_path) or os.path.exists(self.journal_path)
+                or os.path.exists(self.snapshot_path)):
+            return False
+
+        with open(progress_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        wrong_questions = data.get('wrong_questions', [])
+        assign_question_ids(wrong_questions)
+        self.record_submit([question['id'] for question in wrong_questions])
+        if self.writer:
+            self.writer.flush()
+        self.close()
+        os.replace(progress_path, progress_path + ".migrated")
+        return True
+
+
+class ReviewSchedule:
+    """SM-2 spaced-repetition state of every question reviewed as a flash card
+
+    Each card is [ease, interval in days, successful reviews in a row, due
+    timestamp], keyed by stable question ID. Cards are replaced rather than
+    changed in place, so the background writer can save a shallow copy.
+    """
+
+    def __init__(self, path: str, writer: Optional[PersistenceWriter] = None):
+        self.path = path
+        self.writer = writer
+        self.lock = threading.Lock()
+        self.cards = {}
+
+    def load(self):
+        with self.lock:
+            self.cards = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.cards = json.load(f).get('cards', {})
+
+    def due(self, question_id: str) -> float:
+        """When a card is next due; cards never reviewed are due straight away"""
+        card = self.cards.get(question_id)
+        return card[3] if card else 0.0
+
+    def review(self, question_id: str, grade: int, now: Optional[float] = None) -> float:
+        """Apply one SM-2 review with a 0-5 grade and return the card's new due time"""
+        now = time.time() if now is None else now
+        with self.lock:
+            ease, interval, repetitions, _ = self.cards.get(question_id, (REVIEW_INITIAL_EASE, 0, 0, 0.0))
+            if grade < 3:
+                repetitions, interval = 0, 0
+                due = now + REVIEW_RELEARN_SECONDS
+            else:
+                interval = 1 if repetitions == 0 else 6 if repetitions == 1 else round(interval * ease)
+                repetitions += 1
+                due = now + interval * 86400
+            ease = max(REVIEW_MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+            self.cards[question_id] = [ease, interval, repetitions, due]
+
+        if self.writer:
+            self.writer.submit('review-schedule', self.write)
+        else:
+            self.write()
+        return due
+
+    def write(self):
+        with self.lock:
+            cards = dict(self.cards)
+        write_json_atomic(self.path, {'cards': cards, 'timestamp': time.time()})
+
+    def clear(self):
+        """Forget every card's schedule"""
+        with self.lock:
+            self.cards = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class ReviewQueue:
+    """The cards of one spaced-repetition session, as indexes into a deck
+
+    Cards already scheduled sit in a heap of (due, index) pairs, so taking the
+    next due card and putting a reviewed one back are both O(log n). Up to
+    new_limit never-reviewed cards, picked at random, follow once nothing is
+    due. Cards answered "Again" wait in a queue of their own until
+    REVIEW_RELEARN_GAP other cards have been shown, they fall due, or nothing
+    else is left, so the session only ends once every card has been passed.
+    """
+
+    def __init__(self, question_ids: List[str], schedule: ReviewSchedule,
+                 new_limit: int = REVIEW_NEW_CARDS_PER_SESSION):
+        import random
+
+        self.question_ids = question_ids
+        self.heap = []
+        new_cards = []
+        for index, question_id in enumerate(question_ids):
+            if question_id in schedule.cards:
+                self.heap.append((schedule.due(question_id), index))
+            else:
+                new_cards.append(index)
+        heapq.heapify(self.heap)
+        self.new_cards = random.sample(new_cards, min(new_limit, len(new_cards)))
+        self.relearning = deque()  # (cards shown when it may return, due, index), oldest first
+        self.shown = 0
+
+    def __len__(self):
+        return len(self.heap) + len(self.new_cards) + len(self.relearning)
+
+    def next_due(self) -> Optional[float]:
+        """Due time of the earliest scheduled card, or None if there are none"""
+        due_times = []
+        if self.heap:
+            due_times.append(self.heap[0][0])
+        if self.relearning:
+            due_times.append(self.relearning[0][1])
+        return min(due_times, default=None)
+
+    def take(self, now: float) -> Optional[int]:
+        """Deck index of the next card to show, or None if nothing is left for this session
+
+        Relearning cards that are ready come first, then due cards, then new
+        ones. With nothing else left, relearning cards come back early rather
+        than the session ending before they are answered correctly.
+        """
+        if self.relearning and (self.relearning[0][0] <= self.shown or self.relearning[0][1] <= now):
+            index = self.relearning.popleft()[2]
+        elif self.heap and self.heap[0][0] <= now:
+            index = heapq.heappop(self.heap)[1]
+        elif self.new_cards:
+            index = self.new_cards.pop()
+        elif self.relearning:
+            index = self.relearning.popleft()[2]
+        else:
+            return None
+        self.shown += 1
+        return index
+
+    def push(self, index: int, due: float, relearn: bool = False):
+        """Put a reviewed card back, into the relearning queue if it was failed"""
+        if relearn:
+            self.relearning.append((self.shown + REVIEW_RELEARN_GAP, due, index))
+        else:
+            heapq.heappush(self.heap, (due, index))
+
+
+class ImportCancelled(Exception):
+    """Raised inside the import worker when the user cancels an import"""
+
+
+class TickScheduler:
+    """Owns every periodic Tk job of the application
+
+    every() calls a callback on the Tk thread every interval_ms and returns a
+    handle for cancel(). Deadlines are kept on time.monotonic() and each tick is
+    scheduled for the next deadline, not interval_ms after the previous tick
+    finished, so periodic updates don't drift and clock changes don't matter.
+    Jobs tied to a screen are cancelled by cancel_screen() when the app leaves
+    it. A callback that returns False is not called again.
+    """
 
-class RealEstateTestApplication:
     def __init__(self, root):
         self.root = root
+        self.jobs = {}  # handle -> job dict
+        self.next_handle = 1
+
+    @property
+    def active_count(self) -> int:
+        """Number of jobs still scheduled"""
+        return len(self.jobs)
+
+    def every(self, interval_ms: int, callback: Callable[[], Optional[bool]], screen: Optional[str] = None) -> int:
+        handle = self.next_handle
+        self.next_handle += 1
+        interval = interval_ms / 1000
+        job = {
+            'callback': callback,
+            'interval': interval,
+            'due': time.monotonic() + interval,
+            'screen': screen,
+            'after_id': None
+        }
+        self.jobs[handle] = job
+        self._schedule(handle, job)
+        return handle
+
+    def _schedule(self, handle: int, job: Dict):
+        delay_ms = max(0, round((job['due'] - time.monotonic()) * 1000))
+        job['after_id'] = self.root.after(delay_ms, self._tick, handle)
+
+    def _tick(self, handle: int):
+        job = self.jobs.get(handle)
+        if job is None:
+            return
+        job['after_id'] = None
+
+        try:
+            keep = job['callback']() is not False
+        except Exception as e:
+            ui_log.error("Error in scheduled job %d, cancelling it: %s", handle, e)
+            keep = False
+
+        if handle not in self.jobs:
+            return  # Cancelled by its own callback
+        if not keep:
+            del self.jobs[handle]
+            return
+
+        # Skip ticks missed while the Tk thread was busy instead of firing them in a burst
+        now = time.monotonic()
+        job['due'] += job['interval']
+        if job['due'] <= now:
+            job['due'] += job['interval'] * (int((now - job['due']) / job['interval']) + 1)
+        self._schedule(handle, job)
+
+    def cancel(self, handle: Optional[int]):
+        """Stop a job; unknown or already finished handles are ignored"""
+        job = self.jobs.pop(handle, None)
+        if job is not None and job['after_id'] is not None:
+            self.root.after_cancel(job['after_id'])
+
+    def cancel_screen(self, screen: str):
+        """Stop every job tied to the given screen"""
+        for handle in [handle for handle, job in self.jobs.items() if job['screen'] == screen]:
+            self.cancel(handle)
+
+
+class RealEstateTestApplication:
+    def __init__(self, root, startup_timings=None):
+        self.root = root
+        self.startup_timings = startup_timings if startup_timings is not None else {}
+        self.startup_reported = False
+        init_started = time.perf_counter()
         self.root.title("Real Estate Licensing Practice Test")
         self.root.geometry("1200x800")
         self.root.configure(bg='#2c3e50')
 
         # Test data and state
         self.all_questions = []
-        self.current_questions = []
-        self.user_answers = {}
+        self.current_questions = QuestionSetView([])
+        # Per-session answers, one byte per position in current_questions (0 = unanswered)
+        self.answers = bytearray()
+        self.incorrect_positions = set()
+        self.flagged_questions = set()
         self.current_question_index = 0
-        self.wrong_questions = []
+        self.wrong_questions = QuestionSetView([])
         self.correct_count = 0
         self.total_answered = 0
         self.is_mini_test = False
+        self.custom_exam = None  # (length, seed) of the current custom exam
         self.start_time = None
         self.test_file_loaded = False
 
         # Flash cards state
         self.flash_cards_mode = False
         self.is_mini_flash_cards = False
-        self.current_flash_cards = []
+        self.current_flash_cards = QuestionSetView([])
         self.current_flash_index = 0
         self.answer_revealed = False
+        # Spaced-repetition review: a flash cards session driven by a ReviewQueue
+        self.spaced_review = False
+        self.review_queue = None
+        self.reviews_done = 0
 
-        # Persistence file paths
+        # Persistence file paths (saved_test_data.json is only read to migrate it)
         self.test_data_file = "saved_test_data.json"
+        self.database_file = "saved_test_data.db"
+        self.bank_file = "saved_test_data.bank"
         self.progress_file = "saved_progress.json"
-
-        # Load saved data first
-        self.load_saved_data()
-
-        # Load default questions if no saved test data (sample)
-        if not self.all_questions:
-            self.load_default_questions()
-
-        # Create main menu first
+        self.persistence_writer = PersistenceWriter()
+        self.answer_journal = AnswerJournal("saved_progress.journal", "saved_progress_snapshot.json",
+                                            self.persistence_writer)
+        self.review_schedule = ReviewSchedule("saved_review_schedule.json", self.persistence_writer)
+        self.parse_cache = ParseCache("parse_cache")
+
+        # Screens are built the first time they are shown and then kept, so
+        # moving between them only refreshes the labels that show data
+        self.screens = {}
+        self.screen_builders = {
+            'menu': self.build_main_menu_screen,
+            'test': self.build_test_screen,
+            'flash_cards': self.build_flash_cards_screen,
+            'results': self.build_results_screen
+        }
+        self.current_screen = None
+        self.screen_transitions = deque(maxlen=100)
+
+        # Periodic jobs (test timer, background work polling)
+        self.scheduler = TickScheduler(self.root)
+        self.timer_job = None
+
+        # Question rendering
+        self.suppress_answer_trace = False
+        self.render_latencies = deque(maxlen=RENDER_REPORT_INTERVAL)
+        self.renders = 0
+
+        # Show the main menu straight away; saved data (or the sample questions)
+        # is loaded in the background and the menu is rebuilt once it is ready
+        self.data_loaded = False
         self.create_main_menu()
+        self.root.after_idle(lambda: self.record_startup_stage('first_paint', init_started))
+        self.start_loading_saved_data()
 
     def load_default_questions(self):
         """Load default sample questions"""
@@ -111,152 +1895,192 @@ class RealEstateTestApplication:
                 'feedback': 'All firms may operate under fictitious names. However, non-broker owned firms can only be licensed in the company\'s legal name. The name of a salesperson cannot appear in the firm name.'
             }
         ]
+        self.all_questions = [Question.from_dict(question) for question in self.all_questions]
+        assign_question_ids(self.all_questions)
 
     def save_test_data(self):
-        """Save current test data to file"""
+        """Save current test data to file in the background"""
+        questions = list(self.all_questions)
+        test_file_loaded = self.test_file_loaded
+        self.persistence_writer.submit('test_data', lambda: self.write_test_data(questions, test_file_loaded))
+
+    def write_test_data(self, questions, test_file_loaded):
+        """Write the given test data to the question store (also called from the import worker thread)"""
         try:
-            data = {
-                'questions': self.all_questions,
-                'test_file_loaded': self.test_file_loaded,
-                'timestamp': time.time()
-            }
-            with open(self.test_data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"DEBUG: Saved {len(self.all_questions)} questions to {self.test_data_file}")
+            stamp = self.question_store.replace_questions(questions, test_file_loaded)
+            persistence_log.info("Saved %d questions to %s", len(questions), self.database_file)
+        except Exception as e:
+            persistence_log.error("Error saving test data: %s", e)
+            return
+
+        # Large banks get a memory-mapped copy for fast startup and lookups; its
+        # stamp ties it to this version of the store so a stale copy is never used
+        try:
+            if len(questions) >= MAPPED_BANK_MIN_QUESTIONS:
+                write_question_bank(self.bank_file, questions, len(questions), stamp)
+                persistence_log.info("Wrote memory-mapped copy to %s", self.bank_file)
+            elif os.path.exists(self.bank_file):
+                os.remove(self.bank_file)
         except Exception as e:
-            print(f"DEBUG: Error saving test data: {e}")
+            persistence_log.error("Error writing %s: %s", self.bank_file, e)
+
+    def convert_migrated_bank(self, json_path):
+        """Write the memory-mapped copy of a bank just migrated from JSON, if it is large enough"""
+        if self.question_store.question_count() < MAPPED_BANK_MIN_QUESTIONS:
+            return
+        try:
+            count = convert_json_to_bank(json_path, self.bank_file, self.question_store.get_setting('timestamp'))
+            persistence_log.info("Wrote memory-mapped copy of %d questions to %s", count, self.bank_file)
+        except Exception as e:
+            persistence_log.error("Error writing %s: %s", self.bank_file, e)
+
+    def open_mapped_bank(self):
+        """The memory-mapped copy of the store's bank, or None if there is no current one"""
+        if not os.path.exists(self.bank_file):
+            return None
+        try:
+            questions = MappedQuestionList(self.bank_file)
+        except Exception as e:
+            persistence_log.warning("Error opening %s: %s", self.bank_file, e)
+            return None
+        if (questions.stamp != self.question_store.get_setting('timestamp')
+                or len(questions) != self.question_store.question_count()):
+            persistence_log.info("%s is out of date, reading questions from %s", self.bank_file, self.database_file)
+            questions.close()
+            return None
+        return questions
+
+    def question_view(self):
+        """The whole bank, in order, for a test or a deck of flash cards
+
+        The bank list is replaced rather than changed in place when new
+        questions arrive, so the view can share it.
+        """
+        return QuestionSetView(self.all_questions)
 
     def save_progress_data(self):
-        """Save current progress (wrong questions) to file"""
+        """Record the submitted test's wrong questions in the answer journal"""
         try:
-            data = {
-                'wrong_questions': self.wrong_questions,
-                'timestamp': time.time()
-            }
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"DEBUG: Saved {len(self.wrong_questions)} wrong questions to {self.progress_file}")
+            self.answer_journal.record_submit([self.question_id(question) for question in self.wrong_questions])
+            persistence_log.info("Saved %d wrong questions to %s", len(self.wrong_questions),
+                                 self.answer_journal.journal_path)
         except Exception as e:
-            print(f"DEBUG: Error saving progress data: {e}")
+            persistence_log.error("Error saving progress data: %s", e)
+
+    def question_id(self, question):
+        """Stable ID of a question"""
+        return question.id or question_content_id(question)
+
+    def find_questions_by_id(self, question_ids):
+        """Look up questions of the current bank by stable ID, skipping any that are gone"""
+        if isinstance(self.all_questions, (StoredQuestionList, MappedQuestionList)):
+            return self.question_store.get_questions_by_id(question_ids)
+        by_id = {self.question_id(question): question for question in self.all_questions}
+        return [by_id[question_id] for question_id in question_ids if question_id in by_id]
 
     def load_saved_data(self):
         """Load saved test data and progress on startup"""
-        # Load test data
+        # Load test data - only the question count is read here, questions are
+        # fetched from the store when a test needs them
         try:
-            if os.path.exists(self.test_data_file):
-                with open(self.test_data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.all_questions = data.get('questions', [])
-                    self.test_file_loaded = data.get('test_file_loaded', False)
-                    print(f"DEBUG: Loaded {len(self.all_questions)} questions from saved file")
+            self.question_store = QuestionStore(self.database_file)
+            if self.question_store.migrate_json(self.test_data_file):
+                persistence_log.info("Migrated %s to %s", self.test_data_file, self.database_file)
+                self.convert_migrated_bank(self.test_data_file + ".migrated")
+
+            questions = self.open_mapped_bank() or StoredQuestionList(self.question_store)
+            if len(questions):
+                self.all_questions = questions
+                self.test_file_loaded = self.question_store.get_setting('test_file_loaded', False)
+                persistence_log.info("Loaded %d questions from saved file", len(self.all_questions))
             else:
-                print("DEBUG: No saved test data found")
+                persistence_log.info("No saved test data found")
         except Exception as e:
-            print(f"DEBUG: Error loading test data: {e}")
+            persistence_log.error("Error loading test data: %s", e)
             self.all_questions = []
             self.test_file_loaded = False
 
-        # Load progress data
+        # Load default questions if no saved test data (sample)
+        if not self.all_questions:
+            self.load_default_questions()
+
+        # Load progress data - the wrong questions of the last submitted test,
+        # replayed from the answer journal
         try:
-            if os.path.exists(self.progress_file):
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.wrong_questions = data.get('wrong_questions', [])
-                    print(f"DEBUG: Loaded {len(self.wrong_questions)} wrong questions from saved file")
+            if self.answer_journal.migrate_json(self.progress_file):
+                persistence_log.info("Migrated %s to %s", self.progress_file, self.answer_journal.journal_path)
+            self.answer_journal.load()
+            if self.answer_journal.sequence:
+                self.wrong_questions = QuestionSetView(self.find_questions_by_id(self.answer_journal.wrong_ids))
+                persistence_log.info("Loaded %d wrong questions from saved file", len(self.wrong_questions))
             else:
-                print("DEBUG: No saved progress data found")
+                persistence_log.info("No saved progress data found")
         except Exception as e:
-            print(f"DEBUG: Error loading progress data: {e}")
-            self.wrong_questions = []
+            persistence_log.error("Error loading progress data: %s", e)
+            self.wrong_questions = QuestionSetView([])
 
-    def parse_test_file(self, file_content):
-        """Parse uploaded test file and extract questions"""
-        questions = []
+        try:
+            self.review_schedule.load()
+            persistence_log.info("Loaded review schedule for %d cards", len(self.review_schedule.cards))
+        except Exception as e:
+            persistence_log.error("Error loading review schedule: %s", e)
+
+    def start_loading_saved_data(self):
+        """Run load_saved_data on a worker thread, leaving the Tk thread free to paint"""
+        self.load_thread = threading.Thread(target=self.load_worker, name="load-saved-data", daemon=True)
+        self.load_thread.start()
+        self.scheduler.every(STARTUP_POLL_INTERVAL_MS, self.poll_saved_data)
 
+    def load_worker(self):
+        """Load saved data (runs on the loader thread; touches no widgets)"""
+        started = time.perf_counter()
         try:
-            # Split by question markers
-            question_blocks = re.split(r'\*\*Question (\d+)\*\*', file_content)
-
-            # Process each question (skip first empty element)
-            for i in range(1, len(question_blocks), 2):
-                if i + 1 < len(question_blocks):
-                    question_num = int(question_blocks[i])
-                    content = question_blocks[i + 1]
-
-                    # Extract question text
-                    question_match = re.search(r'\*\*Question text\*\*(.*?)Question \d+Answer', content, re.DOTALL)
-                    if not question_match:
-                        continue
-
-                    question_text = question_match.group(1).strip()
-                    question_text = re.sub(r'\s+', ' ', question_text)  # Clean whitespace
-
-                    # Extract multiple choice options
-                    options = {}
-
-                    # Look for answer section
-                    answer_section = re.search(r'Question \d+Answer(.*?)\*\*Feedback\*\*', content, re.DOTALL)
-                    if answer_section:
-                        answer_text = answer_section.group(1)
-
-                        # Extract options using regex
-                        option_pattern = r'([a-d])\\?\.\s*(.*?)(?=\n[a-d]\\?\.|$)'
-                        option_matches = re.findall(option_pattern, answer_text, re.DOTALL)
-
-                        for opt_letter, opt_text in option_matches:
-                            # Clean up option text
-                            opt_text = re.sub(r'\s+', ' ', opt_text.strip())
-                            opt_text = opt_text.replace('\\', '')
-                            if opt_text and not opt_text.startswith('**'):
-                                options[opt_letter] = opt_text
-
-                    # Extract correct answer
-                    answer_match = re.search(r'The correct answer is:\s*(.+)', content)
-                    if answer_match:
-                        correct_answer_text = answer_match.group(1).strip()
-
-                        # Try to match correct answer to option letter
-                        correct_letter = None
-                        for letter, option_text in options.items():
-                            if (option_text.lower() in correct_answer_text.lower() or
-                                    correct_answer_text.lower().startswith(option_text.lower()[:30])):
-                                correct_letter = letter
-                                break
-
-                        # If no match found, try to extract letter from beginning
-                        if not correct_letter:
-                            letter_match = re.match(r'^([a-d])', correct_answer_text.lower())
-                            if letter_match:
-                                correct_letter = letter_match.group(1)
-
-                        correct_answer = correct_letter if correct_letter else correct_answer_text
-                    else:
-                        correct_answer = ""
-
-                    # Extract feedback
-                    feedback_match = re.search(r'\*\*Feedback\*\*(.*?)The correct answer is:', content, re.DOTALL)
-                    feedback = ""
-                    if feedback_match:
-                        feedback = re.sub(r'\s+', ' ', feedback_match.group(1).strip())
-
-                    # Only add question if it has valid options
-                    if len(options) >= 2 and correct_answer:
-                        questions.append({
-                            'number': question_num,
-                            'question': question_text,
-                            'options': options,
-                            'correct_answer': correct_answer,
-                            'feedback': feedback
-                        })
-
-            return questions
+            self.load_saved_data()
+        except Exception as e:
+            persistence_log.error("Error loading saved data: %s", e)
+            self.all_questions = []
+            self.load_default_questions()
+        self.startup_timings['data_load'] = time.perf_counter() - started
+
+    def poll_saved_data(self):
+        """Check on the loader thread; rebuild the menu with the loaded data once it is done"""
+        if self.load_thread.is_alive():
+            return True
+
+        self.data_loaded = True
+        self.create_main_menu()
+        self.root.after_idle(self.report_startup_timing)
+        return False
+
+    def record_startup_stage(self, stage, started):
+        self.startup_timings[stage] = time.perf_counter() - started
+        self.report_startup_timing()
 
+    def report_startup_timing(self):
+        """Print the startup breakdown once every stage has been timed, if asked to"""
+        stages = ('import', 'tk_init', 'first_paint', 'data_load')
+        if not os.environ.get(STARTUP_TIMING_ENV) or self.startup_reported:
+            return
+        if not self.data_loaded or any(stage not in self.startup_timings for stage in stages):
+            return
+        self.startup_reported = True
+        breakdown = ", ".join(f"{stage.replace('_', ' ')} {self.startup_timings[stage] * 1000:.1f} ms"
+                              for stage in stages)
+        print(f"Startup timing: {breakdown}; "
+              f"ready {(time.perf_counter() - STARTUP_STARTED) * 1000:.1f} ms after import began")
+
+    def parse_test_file(self, file_content):
+        """Parse uploaded test file and extract questions"""
+        try:
+            return parse_questions(file_content)
         except Exception as e:
             messagebox.showerror("Parsing Error", f"Error parsing test file: {str(e)}")
             return []
 
     def upload_test_file(self):
         """Allow user to upload a test file"""
+        from tkinter import filedialog
+
         file_path = filedialog.askopenfilename(
             title="Select Test File",
             filetypes=[
@@ -269,52 +2093,320 @@ class RealEstateTestApplication:
         if not file_path:
             return
 
-        try:
-            # Read file content
-            if file_path.endswith('.docx'):
-                # Handle Word documents
-                try:
-                    import docx
-                    doc = docx.Document(file_path)
-                    content = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-                except ImportError:
-                    messagebox.showerror("Error",
-                                         "Please install python-docx to read Word documents:\npip install python-docx")
-                    return
-            else:
-                # Handle text files
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                    content = file.read()
-
-            # Parse the content
-            questions = self.parse_test_file(content)
+        self.start_import(file_path)
+
+    def start_import(self, file_path):
+        """Import a test file on a worker thread while a progress dialog stays responsive"""
+        self.import_messages = queue.Queue()
+        self.import_cancel = threading.Event()
+        self.create_import_dialog(file_path)
+
+        worker = threading.Thread(target=self.import_worker,
+                                  args=(file_path, self.import_messages, self.import_cancel),
+                                  daemon=True)
+        worker.start()
+        self.scheduler.every(IMPORT_POLL_INTERVAL_MS, lambda: self.poll_import(file_path))
+
+    def import_worker(self, file_path, messages, cancel):
+        """Read, parse and save a test file - runs on a worker thread and never touches Tk"""
+        start = time.monotonic()
+        last_report = 0.0
+        progress = {'bytes_read': 0, 'total_bytes': 0}
+
+        def check_cancelled():
+            if cancel.is_set():
+                raise ImportCancelled()
+
+        def report(count, force=False):
+            nonlocal last_report
+            now = time.monotonic()
+            if force or now - last_report >= IMPORT_REPORT_INTERVAL:
+                last_report = now
+                messages.put(('progress', progress['bytes_read'], progress['total_bytes'], count, now - start))
+
+        def on_progress(bytes_read, total_bytes):
+            check_cancelled()
+            progress['bytes_read'] = bytes_read
+            progress['total_bytes'] = total_bytes
 
+        try:
+            # Re-uploads of an unchanged file are served from the parse cache
+            cache_key = self.parse_cache.key_for_file(file_path)
+            questions = self.parse_cache.get(cache_key)
+            if parser_log.isEnabledFor(logging.DEBUG):
+                parser_log.debug("Parse cache %s - %s", 'hit' if questions is not None else 'miss',
+                                 self.parse_cache.stats())
+            if questions is not None:
+                questions = [Question.from_dict(question) for question in questions]
+
+            if questions is None:
+                # Word documents are streamed paragraph by paragraph, text files in chunks
+                reader = iter_question_docx if file_path.endswith('.docx') else iter_question_file
+                questions = []
+                for question in reader(file_path, progress=on_progress):
+                    questions.append(Question.from_dict(question))
+                    check_cancelled()
+                    report(len(questions))
+                report(len(questions), force=True)
+                assign_question_ids(questions)
+
+                if questions:
+                    try:
+                        self.parse_cache.put(cache_key, questions)
+                    except OSError as e:
+                        parser_log.warning("Error writing parse cache: %s", e)
+
+            # Last point at which a cancel leaves the saved data untouched
+            check_cancelled()
             if questions:
-                self.all_questions = questions
-                self.test_file_loaded = True
-                self.save_test_data()  # Save the uploaded test data
-                messagebox.showinfo("Success",
-                                    f"✅ Successfully loaded {len(questions)} questions from file!\n\n"
-                                    f"File: {file_path.split('/')[-1]}\n\n"
-                                    f"📁 Test data saved - no need to re-upload!")
-                self.create_main_menu()  # Refresh menu to show loaded test
-            else:
-                messagebox.showerror("Error",
-                                     "❌ No valid questions found in the file.\n\n"
-                                     "Please make sure the file contains questions in the correct format.")
-
+                # The bank file can't be replaced while it is mapped (on Windows), so
+                # have the Tk thread close the mapping first and wait until it has
+                released = threading.Event()
+                release_errors = []
+                messages.put(('release', released, release_errors))
+                if not released.wait(IMPORT_RELEASE_TIMEOUT):
+                    raise TimeoutError("Timed out waiting to close the saved question bank")
+                if release_errors:
+                    raise OSError(f"Could not close the saved question bank: {release_errors[0]}")
+                self.write_test_data(questions, True)
+            messages.put(('done', questions))
+
+        except ImportCancelled:
+            messages.put(('cancelled',))
         except Exception as e:
-            messagebox.showerror("Error", f"❌ Error reading file: {str(e)}")
+            messages.put(('error', str(e)))
+
+    def create_import_dialog(self, file_path):
+        """Create the modal import progress dialog"""
+        self.import_dialog = tk.Toplevel(self.root)
+        self.import_dialog.title("Importing Test File")
+        self.import_dialog.geometry("450x200")
+        self.import_dialog.configure(bg='#2c3e50')
+        self.import_dialog.transient(self.root)
+        self.import_dialog.grab_set()
+        self.import_dialog.protocol("WM_DELETE_WINDOW", self.cancel_import)
+
+        tk.Label(self.import_dialog,
+                 text=f"📤 Importing {os.path.basename(file_path)}",
+                 font=('Arial', 12, 'bold'),
+                 fg='#ecf0f1',
+                 bg='#2c3e50').pack(pady=(20, 10))
+
+        self.import_progress_bar = ttk.Progressbar(self.import_dialog,
+                                                   length=380,
+                                                   mode='determinate',
+                                                   maximum=100)
+        self.import_progress_bar.pack(pady=5)
+
+        self.import_status_label = tk.Label(self.import_dialog,
+                                            text="Reading file...",
+                                            font=('Arial', 10),
+                                            fg='#bdc3c7',
+                                            bg='#2c3e50')
+        self.import_status_label.pack(pady=5)
+
+        self.import_cancel_button = tk.Button(self.import_dialog,
+                                              text="❌ Cancel",
+                                              font=('Arial', 10),
+                                              bg='#e74c3c',
+                                              fg='white',
+                                              padx=15,
+                                              pady=4,
+                                              command=self.cancel_import)
+        self.import_cancel_button.pack(pady=10)
+
+    def cancel_import(self):
+        """Ask the import worker to stop"""
+        self.import_cancel.set()
+        self.import_status_label.config(text="Cancelling...")
+        self.import_cancel_button.config(state=tk.DISABLED)
+
+    def poll_import(self, file_path):
+        """Apply messages from the import worker on the Tk thread; False once the import is over"""
+        try:
+            while True:
+                message = self.import_messages.get_nowait()
+                kind = message[0]
+
+                if kind == 'progress':
+                    _, bytes_read, total_bytes, count, elapsed = message
+                    self.update_import_progress(bytes_read, total_bytes, count, elapsed)
+                    continue
+                if kind == 'release':
+                    _, released, release_errors = message
+                    try:
+                        self.release_mapped_bank()
+                    except Exception as e:
+                        persistence_log.error("Error closing the mapped bank: %s", e)
+                        release_errors.append(e)
+                    finally:
+                        released.set()
+                    continue
+
+                self.import_dialog.grab_release()
+                self.import_dialog.destroy()
+
+                if kind == 'done':
+                    self.finish_import(file_path, message[1])
+                elif kind == 'cancelled':
+                    messagebox.showinfo("Import Cancelled",
+                                        "Import cancelled - your saved test data was not changed.")
+                else:
+                    messagebox.showerror("Error", f"❌ Error reading file: {message[1]}")
+                return False
+        except queue.Empty:
+            return True
+
+    def release_mapped_bank(self):
+        """Close the memory-mapped bank so its file can be replaced or removed
+
+        Until the next load the same questions are read from the database, and
+        any views onto the mapping are moved over to it.
+        """
+        mapped = self.all_questions
+        if not isinstance(mapped, MappedQuestionList):
+            return
+        stored = StoredQuestionList(self.question_store)
+        self.all_questions = stored
+        for name in ('wrong_questions', 'current_questions', 'current_flash_cards'):
+            view = getattr(self, name)
+            if isinstance(view, QuestionSetView) and view.bank is mapped:
+                setattr(self, name, QuestionSetView(stored, view.positions))
+        mapped.close()
+        persistence_log.info("Closed the memory-mapped bank %s", self.bank_file)
+
+    def update_import_progress(self, bytes_read, total_bytes, count, elapsed):
+        """Show import progress with questions/sec and an ETA"""
+        if self.import_cancel.is_set():
+            return
+
+        fraction = bytes_read / total_bytes if total_bytes else 0
+        self.import_progress_bar.config(value=fraction * 100)
+
+        rate = count / elapsed if elapsed > 0 else 0
+        status = f"{count} questions · {rate:,.0f} questions/sec"
+        if 0 < fraction < 1:
+            remaining = int(elapsed * (1 - fraction) / fraction)
+            status += f" · ETA {remaining // 60:02d}:{remaining % 60:02d}"
+        self.import_status_label.config(text=status)
+
+    def finish_import(self, file_path, questions):
+        """Switch to the imported questions once the worker has saved them"""
+        if questions:
+            self.all_questions = questions
+            self.test_file_loaded = True
+            # The wrong questions' view points into the old bank; find them again in the new one
+            self.wrong_questions = QuestionSetView(self.find_questions_by_id(self.answer_journal.wrong_ids))
+
+            unresolved = count_unresolved_answers(questions)
+            parser_log.info("%d of %d questions have an unresolved correct answer", unresolved, len(questions))
+            unresolved_text = ""
+            if unresolved:
+                unresolved_text = (f"⚠️ {unresolved} questions have a correct answer that doesn't "
+                                   f"match any option - please check them.\n\n")
+
+            messagebox.showinfo("Success",
+                                f"✅ Successfully loaded {len(questions)} questions from file!\n\n"
+                                f"File: {os.path.basename(file_path)}\n\n"
+                                f"{unresolved_text}"
+                                f"📁 Test data saved - no need to re-upload!")
+            self.create_main_menu()  # Refresh menu to show loaded test
+        else:
+            messagebox.showerror("Error",
+                                 "❌ No valid questions found in the file.\n\n"
+                                 "Please make sure the file contains questions in the correct format.")
+
+    def get_screen(self, name):
+        """The cached frame of a screen, building it the first time it is needed"""
+        if name not in self.screens:
+            started = time.perf_counter()
+            self.screens[name] = self.screen_builders[name]()
+            ui_log.debug("Built %s screen in %.1f ms", name, (time.perf_counter() - started) * 1000)
+        return self.screens[name]
+
+    def show_screen(self, name, started):
+        """Swap the visible screen for the cached one and log how long the switch took
+
+        started is when the caller began refreshing the screen's data, so the
+        logged time covers the refresh, the switch and the redraw.
+        """
+        if self.current_screen != name:
+            if self.current_screen is not None:
+                self.scheduler.cancel_screen(self.current_screen)
+                self.screens[self.current_screen].pack_forget()
+            # The main menu scrolls with the mouse wheel while the pointer is over it
+            self.root.unbind_all("<MouseWheel>")
+            self.screens[name].pack(fill=tk.BOTH, expand=True)
+            self.current_screen = name
+
+        def record_transition():
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.screen_transitions.append((name, elapsed_ms))
+            ui_log.debug("Screen transition to %s: %.1f ms, %d scheduled jobs", name, elapsed_ms,
+                         self.scheduler.active_count)
+
+        # Idle callbacks run after Tk has redrawn, so this includes the paint
+        self.root.after_idle(record_transition)
 
     def create_main_menu(self):
-        """Create the main menu interface with scrolling capability"""
-        # Clear any existing widgets
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Show the main menu with its status and buttons refreshed"""
+        started = time.perf_counter()
+        self.get_screen('menu')
+
+        # Anything that needs the question bank stays disabled until it has loaded
+        data_state = tk.NORMAL if self.data_loaded else tk.DISABLED
+        questions_text = f"{len(self.all_questions)} Questions" if self.data_loaded else "Loading..."
+
+        # File status indicator
+        if not self.data_loaded:
+            status_text = "⏳ Loading saved questions..."
+        elif self.test_file_loaded:
+            status_text = f"📁 Loaded: {len(self.all_questions)} questions (Saved Custom File) ✅"
+        else:
+            status_text = f"📁 Loaded: {len(self.all_questions)} questions (Sample Questions) ⚠️"
+
+        # Add progress status if wrong questions exist
+        if self.data_loaded and self.wrong_questions:
+            status_text += f"\n📚 Study Available: {len(self.wrong_questions)} wrong questions from previous test"
+        self.menu_status_label.config(text=status_text)
+
+        self.upload_button.config(state=data_state)
+        self.start_button.config(text=f"🚀 START FULL TEST ({questions_text})", state=data_state)
+        self.flash_cards_button.config(text=f"📚 FLASH CARDS ({questions_text})", state=data_state)
+        self.spaced_review_button.config(state=data_state)
+        self.custom_exam_button.config(state=data_state)
+
+        # Buttons that depend on saved progress are packed in order just before
+        # (or, for clear, after) the exit button
+        for button in (self.menu_mini_test_button, self.menu_mini_flash_button, self.sample_button,
+                       self.clear_button):
+            button.pack_forget()
+
+        # Mini test buttons (if wrong questions exist from previous test)
+        if self.data_loaded and self.wrong_questions:
+            self.menu_mini_test_button.config(text=f"🔄 TAKE MINI TEST ({len(self.wrong_questions)} Questions)")
+            self.menu_mini_test_button.pack(pady=5, before=self.exit_button)
+            self.menu_mini_flash_button.config(
+                text=f"📚 MINI FLASH CARDS ({len(self.wrong_questions)} Questions)")
+            self.menu_mini_flash_button.pack(pady=5, before=self.exit_button)
+
+        # Sample test button (only if using sample questions)
+        if not self.test_file_loaded and self.data_loaded:
+            self.sample_button.pack(pady=5, before=self.exit_button)
+
+        # Clear saved data button (if any saved data exists)
+        if self.test_file_loaded or self.wrong_questions:
+            self.clear_button.pack(pady=5, after=self.exit_button)
+
+        self.show_screen('menu', started)
+
+    def build_main_menu_screen(self):
+        """Build the main menu once, with scrolling capability; create_main_menu fills in the data"""
+        screen = tk.Frame(self.root, bg='#2c3e50')
 
         # Create main canvas and scrollbar for scrolling
-        canvas = tk.Canvas(self.root, bg='#2c3e50')
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
+        canvas = tk.Canvas(screen, bg='#2c3e50')
+        scrollbar = ttk.Scrollbar(screen, orient="vertical", command=canvas.yview)
         scrollable_frame = tk.Frame(canvas, bg='#2c3e50')
 
         scrollable_frame.bind(
@@ -364,22 +2456,12 @@ class RealEstateTestApplication:
         subtitle_label.pack(pady=10)
 
         # File status indicator
-        status_text = f"📁 Loaded: {len(self.all_questions)} questions"
-        if self.test_file_loaded:
-            status_text += " (Saved Custom File) ✅"
-        else:
-            status_text += " (Sample Questions) ⚠️"
-
-        # Add progress status if wrong questions exist
-        if self.wrong_questions:
-            status_text += f"\n📚 Study Available: {len(self.wrong_questions)} wrong questions from previous test"
-
-        status_label = tk.Label(title_frame,
-                                text=status_text,
-                                font=('Arial', 11),
-                                fg='#f39c12',
-                                bg='#2c3e50')
-        status_label.pack(pady=5)
+        self.menu_status_label = tk.Label(title_frame,
+                                          text="",
+                                          font=('Arial', 11),
+                                          fg='#f39c12',
+                                          bg='#2c3e50')
+        self.menu_status_label.pack(pady=5)
 
         # Upload section
         upload_frame = tk.Frame(main_container, bg='#8e44ad', relief=tk.RAISED, bd=2)
@@ -410,18 +2492,18 @@ Upload your own test file with multiple choice questions for the complete exam e
                                 justify=tk.CENTER)
         upload_label.pack(pady=(0, 10), padx=20)
 
-        upload_button = tk.Button(upload_frame,
-                                  text="📤 UPLOAD TEST FILE",
-                                  font=('Arial', 12, 'bold'),
-                                  bg='#9b59b6',
-                                  fg='white',
-                                  activebackground='#8e44ad',
-                                  activeforeground='white',
-                                  padx=20,
-                                  pady=10,
-                                  cursor='hand2',
-                                  command=self.upload_test_file)
-        upload_button.pack(pady=(0, 15))
+        self.upload_button = tk.Button(upload_frame,
+                                       text="📤 UPLOAD TEST FILE",
+                                       font=('Arial', 12, 'bold'),
+                                       bg='#9b59b6',
+                                       fg='white',
+                                       activebackground='#8e44ad',
+                                       activeforeground='white',
+                                       padx=20,
+                                       pady=10,
+                                       cursor='hand2',
+                                       command=self.upload_test_file)
+        self.upload_button.pack(pady=(0, 15))
 
         # Instructions section
         instructions_frame = tk.Frame(main_container, bg='#34495e', relief=tk.RAISED, bd=2)
@@ -486,105 +2568,126 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         buttons_frame.pack(pady=30)
 
         # Start test button
-        start_button = tk.Button(buttons_frame,
-                                 text=f"🚀 START FULL TEST ({len(self.all_questions)} Questions)",
-                                 font=('Arial', 16, 'bold'),
-                                 bg='#27ae60',
-                                 fg='white',
-                                 activebackground='#2ecc71',
-                                 activeforeground='white',
-                                 padx=30,
-                                 pady=15,
-                                 cursor='hand2',
-                                 command=self.start_full_test)
-        start_button.pack(pady=10)
+        self.start_button = tk.Button(buttons_frame,
+                                      text="",
+                                      font=('Arial', 16, 'bold'),
+                                      bg='#27ae60',
+                                      fg='white',
+                                      activebackground='#2ecc71',
+                                      activeforeground='white',
+                                      padx=30,
+                                      pady=15,
+                                      cursor='hand2',
+                                      command=self.start_full_test)
+        self.start_button.pack(pady=10)
+
+        # Custom exam button
+        self.custom_exam_button = tk.Button(buttons_frame,
+                                            text="🎯 CUSTOM EXAM (Weighted to Your Misses)",
+                                            font=('Arial', 14, 'bold'),
+                                            bg='#2980b9',
+                                            fg='white',
+                                            activebackground='#3498db',
+                                            activeforeground='white',
+                                            padx=25,
+                                            pady=12,
+                                            cursor='hand2',
+                                            command=self.ask_custom_exam)
+        self.custom_exam_button.pack(pady=5)
 
         # Flash cards button
-        flash_cards_button = tk.Button(buttons_frame,
-                                       text=f"📚 FLASH CARDS ({len(self.all_questions)} Questions)",
-                                       font=('Arial', 14, 'bold'),
-                                       bg='#9b59b6',
+        self.flash_cards_button = tk.Button(buttons_frame,
+                                            text="",
+                                            font=('Arial', 14, 'bold'),
+                                            bg='#9b59b6',
+                                            fg='white',
+                                            activebackground='#8e44ad',
+                                            activeforeground='white',
+                                            padx=25,
+                                            pady=12,
+                                            cursor='hand2',
+                                            command=self.start_flash_cards)
+        self.flash_cards_button.pack(pady=5)
+
+        # Spaced review button
+        self.spaced_review_button = tk.Button(buttons_frame,
+                                              text="🧠 SPACED REVIEW (Due Cards)",
+                                              font=('Arial', 14, 'bold'),
+                                              bg='#16a085',
+                                              fg='white',
+                                              activebackground='#1abc9c',
+                                              activeforeground='white',
+                                              padx=25,
+                                              pady=12,
+                                              cursor='hand2',
+                                              command=self.start_spaced_review)
+        self.spaced_review_button.pack(pady=5)
+
+        # Mini test button (packed by create_main_menu if wrong questions exist from previous test)
+        self.menu_mini_test_button = tk.Button(buttons_frame,
+                                               text="",
+                                               font=('Arial', 14, 'bold'),
+                                               bg='#e74c3c',
+                                               fg='white',
+                                               activebackground='#c0392b',
+                                               activeforeground='white',
+                                               padx=25,
+                                               pady=12,
+                                               cursor='hand2',
+                                               command=self.start_mini_test)
+
+        # Mini flash cards button (packed by create_main_menu if wrong questions exist)
+        self.menu_mini_flash_button = tk.Button(buttons_frame,
+                                                text="",
+                                                font=('Arial', 14, 'bold'),
+                                                bg='#8e44ad',
+                                                fg='white',
+                                                activebackground='#7d3c98',
+                                                activeforeground='white',
+                                                padx=25,
+                                                pady=12,
+                                                cursor='hand2',
+                                                command=self.start_mini_flash_cards)
+
+        # Sample test button (packed by create_main_menu only if using sample questions)
+        self.sample_button = tk.Button(buttons_frame,
+                                       text="📝 SAMPLE TEST (5 Questions)",
+                                       font=('Arial', 14),
+                                       bg='#3498db',
                                        fg='white',
-                                       activebackground='#8e44ad',
+                                       activebackground='#5dade2',
                                        activeforeground='white',
-                                       padx=25,
-                                       pady=12,
+                                       padx=20,
+                                       pady=10,
                                        cursor='hand2',
-                                       command=self.start_flash_cards)
-        flash_cards_button.pack(pady=5)
-
-        # Mini test button (if wrong questions exist from previous test)
-        if self.wrong_questions:
-            mini_test_button = tk.Button(buttons_frame,
-                                         text=f"🔄 TAKE MINI TEST ({len(self.wrong_questions)} Questions)",
-                                         font=('Arial', 14, 'bold'),
-                                         bg='#e74c3c',
-                                         fg='white',
-                                         activebackground='#c0392b',
-                                         activeforeground='white',
-                                         padx=25,
-                                         pady=12,
-                                         cursor='hand2',
-                                         command=self.start_mini_test)
-            mini_test_button.pack(pady=5)
-
-            # Mini flash cards button (if wrong questions exist)
-            mini_flash_button = tk.Button(buttons_frame,
-                                          text=f"📚 MINI FLASH CARDS ({len(self.wrong_questions)} Questions)",
-                                          font=('Arial', 14, 'bold'),
-                                          bg='#8e44ad',
-                                          fg='white',
-                                          activebackground='#7d3c98',
-                                          activeforeground='white',
-                                          padx=25,
-                                          pady=12,
-                                          cursor='hand2',
-                                          command=self.start_mini_flash_cards)
-            mini_flash_button.pack(pady=5)
-
-        # Sample test button (only if using sample questions)
-        if not self.test_file_loaded:
-            sample_button = tk.Button(buttons_frame,
-                                      text="📝 SAMPLE TEST (5 Questions)",
-                                      font=('Arial', 14),
-                                      bg='#3498db',
-                                      fg='white',
-                                      activebackground='#5dade2',
-                                      activeforeground='white',
-                                      padx=20,
-                                      pady=10,
-                                      cursor='hand2',
-                                      command=self.start_sample_test)
-            sample_button.pack(pady=5)
+                                       command=self.start_sample_test)
 
         # Exit button
-        exit_button = tk.Button(buttons_frame,
-                                text="❌ EXIT APPLICATION",
-                                font=('Arial', 12),
-                                bg='#e74c3c',
-                                fg='white',
-                                activebackground='#ec7063',
-                                activeforeground='white',
-                                padx=20,
-                                pady=8,
-                                cursor='hand2',
-                                command=self.root.quit)
-        exit_button.pack(pady=10)
-
-        # Clear saved data button (if any saved data exists)
-        if self.test_file_loaded or self.wrong_questions:
-            clear_button = tk.Button(buttons_frame,
-                                     text="🗑️ CLEAR SAVED DATA",
-                                     font=('Arial', 10),
-                                     bg='#7f8c8d',
+        self.exit_button = tk.Button(buttons_frame,
+                                     text="❌ EXIT APPLICATION",
+                                     font=('Arial', 12),
+                                     bg='#e74c3c',
                                      fg='white',
-                                     activebackground='#5d6d7e',
+                                     activebackground='#ec7063',
                                      activeforeground='white',
-                                     padx=15,
-                                     pady=6,
+                                     padx=20,
+                                     pady=8,
                                      cursor='hand2',
-                                     command=self.clear_saved_data)
-            clear_button.pack(pady=5)
+                                     command=self.root.quit)
+        self.exit_button.pack(pady=10)
+
+        # Clear saved data button (packed by create_main_menu if any saved data exists)
+        self.clear_button = tk.Button(buttons_frame,
+                                      text="🗑️ CLEAR SAVED DATA",
+                                      font=('Arial', 10),
+                                      bg='#7f8c8d',
+                                      fg='white',
+                                      activebackground='#5d6d7e',
+                                      activeforeground='white',
+                                      padx=15,
+                                      pady=6,
+                                      cursor='hand2',
+                                      command=self.clear_saved_data)
 
         # Footer
         footer_label = tk.Label(main_container,
@@ -594,28 +2697,170 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                 bg='#2c3e50')
         footer_label.pack(side=tk.BOTTOM, pady=20)
 
+        return screen
+
     def start_flash_cards(self):
         """Start flash cards mode with all questions"""
         if not self.all_questions:
             messagebox.showerror("No Questions", "Please upload a test file first!")
             return
 
-        import random
-        self.current_flash_cards = self.all_questions.copy()
-        random.shuffle(self.current_flash_cards)  # Randomize the questions
+        self.current_flash_cards = self.question_view().shuffled()
         self.is_mini_flash_cards = False
+        self.spaced_review = False
         self.flash_cards_mode = True
         self.current_flash_index = 0
         self.answer_revealed = False
         self.create_flash_cards_interface()
 
+    def start_spaced_review(self):
+        """Start a flash cards session of due cards, earliest first, then a few new ones, scheduled with SM-2"""
+        if not self.all_questions:
+            messagebox.showerror("No Questions", "Please upload a test file first!")
+            return
+
+        self.current_flash_cards = self.question_view()
+        self.review_queue = ReviewQueue(self.deck_question_ids(self.current_flash_cards), self.review_schedule)
+        self.reviews_done = 0
+        self.is_mini_flash_cards = False
+        self.spaced_review = True
+        self.flash_cards_mode = True
+        self.answer_revealed = False
+        if self.take_due_card():
+            self.create_flash_cards_interface()
+        else:
+            self.spaced_review_complete()
+
+    def deck_question_ids(self, deck: QuestionSetView) -> List[str]:
+        """Stable IDs of a deck's cards, read in one query when the bank lives in the store"""
+        if isinstance(deck.bank, (StoredQuestionList, MappedQuestionList)):
+            bank_ids = self.question_store.question_ids()
+            return [bank_ids[position] for position in deck.positions]
+        return [self.question_id(question) for question in deck]
+
+    def bank_positions(self, question_ids: List[str]) -> Dict[str, int]:
+        """Bank positions of the given question IDs, skipping any not in the bank"""
+        if isinstance(self.all_questions, (StoredQuestionList, MappedQuestionList)):
+            return self.question_store.positions_by_id(question_ids)
+        if not question_ids:
+            return {}
+        wanted = set(question_ids)
+        bank_ids = map(self.question_id, self.all_questions)
+        return {question_id: position for position, question_id in enumerate(bank_ids) if question_id in wanted}
+
+    def take_due_card(self) -> bool:
+        """Make the next card of the spaced review current; False once the session is over"""
+        index = self.review_queue.take(time.time())
+        if index is None:
+            return False
+        self.current_flash_index = index
+        self.answer_revealed = False
+        return True
+
+    def grade_flash_card(self, grade):
+        """Reschedule the current card in a spaced review and show the next due one"""
+        question_id = self.review_queue.question_ids[self.current_flash_index]
+        due = self.review_schedule.review(question_id, grade)
+        self.review_queue.push(self.current_flash_index, due, relearn=grade < 3)
+        self.reviews_done += 1
+        if self.take_due_card():
+            self.display_flash_card()
+        else:
+            self.spaced_review_complete()
+
+    def spaced_review_complete(self):
+        """Tell the user when the next card is due and go back to the menu"""
+        next_due = self.review_queue.next_due()
+        message = f"🎉 Spaced Review Complete!\n\nYou reviewed {self.reviews_done} cards.\n\n"
+        if next_due is not None:
+            message += f"Next card due: {time.strftime('%a %b %d, %H:%M', time.localtime(next_due))}"
+        messagebox.showinfo("Spaced Review Complete", message)
+        self.return_to_menu()
+
     def start_full_test(self):
         """Start the full test with all questions"""
         if not self.all_questions:
             messagebox.showerror("No Questions", "Please upload a test file first!")
             return
 
-        self.current_questions = self.all_questions.copy()
+        self.current_questions = self.question_view()
+        self.is_mini_test = False
+        self.custom_exam = None
+        self.flash_cards_mode = False
+        self.reset_test_state()
+        self.create_test_interface()
+
+    def ask_custom_exam(self):
+        """Ask how many questions the custom exam should have, and optionally a seed to repeat a draw
+
+        The draw is weighted by the answer history, so a seed only repeats it
+        while that history is unchanged.
+        """
+        if not self.all_questions:
+            messagebox.showerror("No Questions", "Please upload a test file first!")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Custom Exam")
+        dialog.geometry("360x250")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Number of questions:", font=('Arial', 12)).pack(pady=(20, 5))
+        length_entry = tk.Entry(dialog, font=('Arial', 12), width=10)
+        length_entry.insert(0, str(min(CUSTOM_EXAM_DEFAULT_LENGTH, len(self.all_questions))))
+        length_entry.pack()
+        length_entry.focus()
+
+        tk.Label(dialog, text="Seed (optional, repeats a draw until\nyou answer more questions):",
+                 font=('Arial', 10)).pack(pady=(10, 5))
+        seed_entry = tk.Entry(dialog, font=('Arial', 12), width=10)
+        seed_entry.pack()
+
+        def start():
+            try:
+                length = int(length_entry.get())
+                seed = int(seed_entry.get()) if seed_entry.get().strip() else None
+            except ValueError:
+                messagebox.showerror("Invalid", "Please enter whole numbers")
+                return
+            if not 1 <= length <= len(self.all_questions):
+                messagebox.showerror("Invalid", f"Please enter a number between 1 and {len(self.all_questions)}")
+                return
+            dialog.destroy()
+            self.start_custom_exam(length, seed)
+
+        tk.Button(dialog, text="Start", command=start, bg='#27ae60', fg='white', padx=20).pack(pady=15)
+        length_entry.bind('<Return>', lambda e: start())
+        seed_entry.bind('<Return>', lambda e: start())
+
+    def start_custom_exam(self, length, seed=None):
+        """Start a test of length questions, drawn without replacement and weighted toward ones often missed"""
+        import random
+
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        started = time.perf_counter()
+        bank = self.question_view()
+        weights = miss_rate_weights(len(bank), self.bank_positions(list(self.answer_journal.stats)),
+                                    self.answer_journal.stats)
+        positions = weighted_sample(weights, length, seed)
+        engine_log.info("Drew a %d-question custom exam from %d questions with seed %d in %.1f ms",
+                        len(positions), len(bank), seed, (time.perf_counter() - started) * 1000)
+
+        self.current_questions = bank.subset(positions)
+        self.is_mini_test = False
+        self.custom_exam = (length, seed)
+        self.flash_cards_mode = False
+        self.reset_test_state()
+        self.create_test_interface()
+
+    def retake_custom_exam(self):
+        """Take the current custom exam again with the same questions
+
+        Redrawing from the seed would give a different exam, since the answers
+        just given have changed the weights.
+        """
         self.is_mini_test = False
         self.flash_cards_mode = False
         self.reset_test_state()
@@ -623,34 +2868,32 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
 
     def start_mini_flash_cards(self):
         """Start mini flash cards with only wrong questions"""
-        print("DEBUG: start_mini_flash_cards method called!")  # Debug line
-
         if not self.wrong_questions:
             messagebox.showinfo("Perfect Score!", "🎉 You got all questions correct! No wrong answers to study.")
             return
 
-        print(f"DEBUG: Starting mini flash cards with {len(self.wrong_questions)} wrong questions")  # Debug line
+        engine_log.debug("Starting mini flash cards with %d wrong questions", len(self.wrong_questions))
 
-        import random
-        self.current_flash_cards = self.wrong_questions.copy()
-        random.shuffle(self.current_flash_cards)  # Randomize the wrong questions
+        self.current_flash_cards = self.wrong_questions.shuffled()
 
         # Reset all states to ensure clean flash cards mode
         self.is_mini_flash_cards = True
+        self.spaced_review = False
         self.flash_cards_mode = True
         self.is_mini_test = False  # Make sure this is False
         self.current_flash_index = 0
         self.answer_revealed = False
 
-        print(
-            f"DEBUG: Flash cards mode set - is_mini_flash_cards: {self.is_mini_flash_cards}, flash_cards_mode: {self.flash_cards_mode}")  # Debug line
+        engine_log.debug("Flash cards mode set - is_mini_flash_cards: %s, flash_cards_mode: %s",
+                         self.is_mini_flash_cards, self.flash_cards_mode)
 
         self.create_flash_cards_interface()
 
     def start_sample_test(self):
         """Start a sample test with available questions"""
-        self.current_questions = self.all_questions.copy()
+        self.current_questions = self.question_view()
         self.is_mini_test = False
+        self.custom_exam = None
         self.flash_cards_mode = False
         self.reset_test_state()
         self.create_test_interface()
@@ -661,70 +2904,108 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
             messagebox.showinfo("Perfect Score!", "🎉 You got all questions correct! No mini test needed.")
             return
 
-        # Create a deep copy of wrong questions for mini test
-        self.current_questions = []
-        for wrong_q in self.wrong_questions:
-            # Make sure we copy the complete question data
-            mini_question = {
-                'number': wrong_q['number'],
-                'question': wrong_q['question'],
-                'options': wrong_q['options'].copy(),
-                'correct_answer': wrong_q['correct_answer'],
-                'feedback': wrong_q['feedback']
-            }
-            self.current_questions.append(mini_question)
+        # Views are read-only, so the mini test can share the wrong questions' view
+        self.current_questions = self.wrong_questions
 
         self.is_mini_test = True
+        self.custom_exam = None
         self.flash_cards_mode = False
         self.reset_test_state()
         self.create_test_interface()
 
-        print(f"DEBUG: Mini test started with {len(self.current_questions)} wrong questions")  # Debug line
+        engine_log.debug("Mini test started with %d wrong questions", len(self.current_questions))
 
     def reset_test_state(self):
         """Reset all test-related state variables"""
-        self.user_answers = {}
+        self.answers = bytearray(len(self.current_questions))
+        self.incorrect_positions = set()
+        self.flagged_questions = set()
         self.current_question_index = 0
         self.correct_count = 0
         self.total_answered = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         # Clear any existing answer variable if it exists
         if hasattr(self, 'answer_var'):
-            self.answer_var.set("")
+            self.set_answer_var("")
         # Reset flash cards state
         self.flash_cards_mode = False
         self.is_mini_flash_cards = False
         self.answer_revealed = False
 
     def create_test_interface(self):
-        """Create the test-taking interface"""
-        # Clear main menu
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Show the test-taking interface for the current questions"""
+        started = time.perf_counter()
+        self.get_screen('test')
+
+        if self.is_mini_test:
+            test_title = "🔄 MINI TEST (Wrong Answers Only)"
+        elif self.custom_exam:
+            test_title = f"🎯 CUSTOM EXAM ({len(self.current_questions)} Questions)"
+        else:
+            test_title = "📚 REAL ESTATE PRACTICE TEST"
+        self.test_title_label.config(text=test_title)
+        self.progress_bar.config(maximum=len(self.current_questions))
+        self.timer_label.config(text="Time: 00:00")
+        self.update_score_display()
+        self.reset_navigator()
+        self.show_screen('test', started)
+
+        # Start timer and display first question
+        self.start_timer()
+        self.display_question()
+
+    def build_test_screen(self):
+        """Build the test-taking interface once; create_test_interface fills in the data"""
+        from tkinter import scrolledtext
+
+        screen = tk.Frame(self.root, bg='#2c3e50')
 
         # Main frame
-        main_frame = tk.Frame(self.root, bg='#ecf0f1')
+        main_frame = tk.Frame(screen, bg='#ecf0f1')
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Header frame
         header_frame = tk.Frame(main_frame, bg='#34495e', relief=tk.RAISED, bd=2)
         header_frame.pack(fill=tk.X, pady=(0, 10))
 
+        # Question navigator down the right-hand side
+        navigator_frame = tk.LabelFrame(main_frame,
+                                        text="Questions",
+                                        font=('Arial', 12, 'bold'),
+                                        bg='#ecf0f1',
+                                        fg='#2c3e50')
+        navigator_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
+
+        self.navigator_canvas = tk.Canvas(navigator_frame,
+                                          width=NAVIGATOR_COLUMNS * NAVIGATOR_CELL,
+                                          bg='#ffffff',
+                                          highlightthickness=0)
+        self.navigator_scrollbar = ttk.Scrollbar(navigator_frame, orient="vertical",
+                                                 command=self.navigator_canvas.yview)
+        self.navigator_canvas.configure(yscrollcommand=self.on_navigator_scroll)
+        self.navigator_canvas.pack(side=tk.LEFT, fill=tk.Y, padx=(5, 0), pady=5)
+        self.navigator_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        self.navigator_canvas.bind('<Configure>', lambda e: self.cull_navigator())
+        self.navigator_canvas.bind('<Button-1>', self.on_navigator_click)
+        self.navigator_canvas.bind('<MouseWheel>', lambda e: self.navigator_canvas.yview_scroll(
+            int(-1 * (e.delta / 120)), "units"))
+        self.navigator_cells = {}
+        self.navigator_current = None
+
         # Title
-        test_title = "🔄 MINI TEST (Wrong Answers Only)" if self.is_mini_test else "📚 REAL ESTATE PRACTICE TEST"
-        title_label = tk.Label(header_frame,
-                               text=test_title,
-                               font=('Arial', 18, 'bold'),
-                               fg='#ecf0f1',
-                               bg='#34495e')
-        title_label.pack(pady=10)
+        self.test_title_label = tk.Label(header_frame,
+                                         text="",
+                                         font=('Arial', 18, 'bold'),
+                                         fg='#ecf0f1',
+                                         bg='#34495e')
+        self.test_title_label.pack(pady=10)
 
         # Progress and scoring info
         info_frame = tk.Frame(header_frame, bg='#34495e')
         info_frame.pack(pady=(0, 10))
 
         self.progress_label = tk.Label(info_frame,
-                                       text="Question 1 of " + str(len(self.current_questions)),
+                                       text="",
                                        font=('Arial', 12),
                                        fg='#bdc3c7',
                                        bg='#34495e')
@@ -741,8 +3022,7 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         # Progress bar
         self.progress_bar = ttk.Progressbar(info_frame,
                                             length=600,
-                                            mode='determinate',
-                                            maximum=len(self.current_questions))
+                                            mode='determinate')
         self.progress_bar.pack(pady=5)
 
         # Timer
@@ -767,6 +3047,7 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                                        wrap=tk.WORD,
                                                        state=tk.DISABLED,
                                                        bg='#ffffff')
+        self.question_text.tag_config("title", font=('Arial', 11, 'bold'), foreground='#2c3e50')
         self.question_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Options frame
@@ -809,6 +3090,9 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                        bg='#ecf0f1')
         self.feedback_label.pack()
 
+        # What display_question last put in each widget, so it can skip unchanged ones
+        self.rendered = {}
+
         # Navigation frame
         nav_frame = tk.Frame(main_frame, bg='#ecf0f1')
         nav_frame.pack(fill=tk.X)
@@ -849,7 +3133,17 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                 padx=10,
                                 pady=6,
                                 command=self.jump_to_question)
-        jump_button.pack()
+        jump_button.pack(side=tk.LEFT, padx=5)
+
+        self.flag_button = tk.Button(center_nav,
+                                     text="🚩 Flag",
+                                     font=('Arial', 10),
+                                     bg='#e67e22',
+                                     fg='white',
+                                     padx=10,
+                                     pady=6,
+                                     command=self.toggle_flag)
+        self.flag_button.pack(side=tk.LEFT, padx=5)
 
         # Right side navigation
         right_nav = tk.Frame(nav_frame, bg='#ecf0f1')
@@ -875,36 +3169,69 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                        command=self.submit_test)
         self.submit_button.pack(side=tk.RIGHT, padx=(10, 10))
 
-        # Start timer and display first question
-        self.start_timer()
-        self.display_question()
+        return screen
 
     def create_flash_cards_interface(self):
-        """Create the flash cards interface"""
-        print(
-            f"DEBUG: Creating flash cards interface - flash_cards_mode: {self.flash_cards_mode}, is_mini_flash_cards: {self.is_mini_flash_cards}")  # Debug line
+        """Show the flash cards interface for the current cards"""
+        ui_log.debug("Creating flash cards interface - flash_cards_mode: %s, is_mini_flash_cards: %s",
+                     self.flash_cards_mode, self.is_mini_flash_cards)
 
         # Safety check to ensure we're in flash cards mode
         if not self.flash_cards_mode:
-            print("ERROR: Not in flash cards mode, returning to menu")  # Debug line
+            ui_log.error("Not in flash cards mode, returning to menu")
             self.return_to_menu()
             return
 
         # Check if we have flash cards to display
         if not hasattr(self, 'current_flash_cards') or not self.current_flash_cards:
-            print("ERROR: No flash cards to display")  # Debug line
+            ui_log.error("No flash cards to display")
             messagebox.showerror("Error", "No flash cards available")
             self.return_to_menu()
             return
 
-        print(f"DEBUG: About to create interface with {len(self.current_flash_cards)} flash cards")  # Debug line
+        ui_log.debug("About to create interface with %d flash cards", len(self.current_flash_cards))
+
+        started = time.perf_counter()
+        self.get_screen('flash_cards')
 
-        # Clear any existing widgets
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        if self.spaced_review:
+            title_text = "🧠 SPACED REVIEW (Due Cards)"
+        elif self.is_mini_flash_cards:
+            title_text = "📚 MINI FLASH CARDS (Wrong Answers)"
+        else:
+            title_text = "📚 FLASH CARDS (All Questions)"
+        self.flash_title_label.config(text=title_text)
+
+        # Spaced review grades the card with Again / Good / Easy instead of moving through the deck
+        self.flash_easy_button.pack_forget()
+        if self.spaced_review:
+            self.prev_flash_button.pack_forget()
+            self.try_again_button.config(text="🔄 AGAIN")
+            self.next_flash_button.config(text="✅ GOOD")
+            self.flash_easy_button.pack(side=tk.LEFT, padx=10, after=self.next_flash_button)
+        else:
+            self.prev_flash_button.pack(side=tk.LEFT, padx=10, before=self.try_again_button)
+            self.try_again_button.config(text="🔄 TRY AGAIN")
+            self.next_flash_button.config(text="NEXT ➡️")
+
+        # Mini Test button (only for mini flash cards)
+        self.flash_mini_test_button.pack_forget()
+        if self.is_mini_flash_cards:
+            self.flash_mini_test_button.pack(side=tk.RIGHT, padx=10, before=self.flash_menu_button)
+
+        self.show_screen('flash_cards', started)
+
+        # Display the current flash card
+        self.display_flash_card()
+
+    def build_flash_cards_screen(self):
+        """Build the flash cards interface once; create_flash_cards_interface fills in the data"""
+        from tkinter import scrolledtext
+
+        screen = tk.Frame(self.root, bg='#2c3e50')
 
         # Main frame with full window
-        main_frame = tk.Frame(self.root, bg='#2c3e50')
+        main_frame = tk.Frame(screen, bg='#2c3e50')
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         # Header
@@ -912,23 +3239,20 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         header_frame.pack(fill=tk.X, pady=(0, 20))
 
         # Title
-        title_text = "📚 MINI FLASH CARDS (Wrong Answers)" if self.is_mini_flash_cards else "📚 FLASH CARDS (All Questions)"
-        title_label = tk.Label(header_frame,
-                               text=title_text,
-                               font=('Arial', 20, 'bold'),
-                               fg='#ecf0f1',
-                               bg='#34495e')
-        title_label.pack(pady=15)
+        self.flash_title_label = tk.Label(header_frame,
+                                          text="",
+                                          font=('Arial', 20, 'bold'),
+                                          fg='#ecf0f1',
+                                          bg='#34495e')
+        self.flash_title_label.pack(pady=15)
 
         # Progress info
-        total_cards = len(self.current_flash_cards)
-        current_card = self.current_flash_index + 1
-        self.progress_label = tk.Label(header_frame,
-                                       text=f"Card {current_card} of {total_cards}",
-                                       font=('Arial', 14),
-                                       fg='#bdc3c7',
-                                       bg='#34495e')
-        self.progress_label.pack(pady=5)
+        self.flash_progress_label = tk.Label(header_frame,
+                                             text="",
+                                             font=('Arial', 14),
+                                             fg='#bdc3c7',
+                                             bg='#34495e')
+        self.flash_progress_label.pack(pady=5)
 
         # Question display frame
         question_frame = tk.Frame(main_frame, bg='#ecf0f1', relief=tk.RAISED, bd=3)
@@ -1003,31 +3327,38 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                            command=self.next_flash_card)
         self.next_flash_button.pack(side=tk.LEFT, padx=10)
 
-        # Mini Test button (only for mini flash cards)
-        if self.is_mini_flash_cards:
-            mini_test_button = tk.Button(self.nav_frame,
-                                         text="🔄 TAKE MINI TEST",
-                                         font=('Arial', 12, 'bold'),
-                                         bg='#e74c3c',
-                                         fg='white',
-                                         padx=20,
-                                         pady=10,
-                                         command=self.start_mini_test)
-            mini_test_button.pack(side=tk.RIGHT, padx=10)
+        # Easy button (packed by create_flash_cards_interface only for spaced review)
+        self.flash_easy_button = tk.Button(self.nav_frame,
+                                           text="⭐ EASY",
+                                           font=('Arial', 12, 'bold'),
+                                           bg='#16a085',
+                                           fg='white',
+                                           padx=20,
+                                           pady=10,
+                                           command=lambda: self.grade_flash_card(REVIEW_EASY))
+
+        # Mini Test button (packed by create_flash_cards_interface only for mini flash cards)
+        self.flash_mini_test_button = tk.Button(self.nav_frame,
+                                                text="🔄 TAKE MINI TEST",
+                                                font=('Arial', 12, 'bold'),
+                                                bg='#e74c3c',
+                                                fg='white',
+                                                padx=20,
+                                                pady=10,
+                                                command=self.start_mini_test)
 
         # Main menu button
-        menu_button = tk.Button(self.nav_frame,
-                                text="🏠 MAIN MENU",
-                                font=('Arial', 12),
-                                bg='#7f8c8d',
-                                fg='white',
-                                padx=20,
-                                pady=10,
-                                command=self.return_to_menu)
-        menu_button.pack(side=tk.RIGHT, padx=10)
+        self.flash_menu_button = tk.Button(self.nav_frame,
+                                           text="🏠 MAIN MENU",
+                                           font=('Arial', 12),
+                                           bg='#7f8c8d',
+                                           fg='white',
+                                           padx=20,
+                                           pady=10,
+                                           command=self.return_to_menu)
+        self.flash_menu_button.pack(side=tk.RIGHT, padx=10)
 
-        # Display the current flash card
-        self.display_flash_card()
+        return screen
 
     def display_flash_card(self):
         """Display the current flash card"""
@@ -1039,14 +3370,17 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
 
         # Update progress
         total_cards = len(self.current_flash_cards)
-        current_card = self.current_flash_index + 1
-        self.progress_label.config(text=f"Card {current_card} of {total_cards}")
+        if self.spaced_review:
+            self.flash_progress_label.config(text=f"Review {self.reviews_done + 1} - {total_cards} cards in deck")
+        else:
+            current_card = self.current_flash_index + 1
+            self.flash_progress_label.config(text=f"Card {current_card} of {total_cards}")
 
         # Display question
         self.flash_question_text.config(state=tk.NORMAL)
         self.flash_question_text.delete(1.0, tk.END)
-        question_title = f"Question {question_data['number']}:\n\n"
-        self.flash_question_text.insert(1.0, question_title + question_data['question'])
+        question_title = f"Question {question_data.number}:\n\n"
+        self.flash_question_text.insert(1.0, question_title + question_data.question)
 
         # Highlight question number
         self.flash_question_text.tag_add("title", "1.0", f"1.{len(question_title)}")
@@ -1076,15 +3410,13 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         self.flash_answer_text.delete(1.0, tk.END)
 
         # Find correct answer text
-        correct_letter = question_data['correct_answer'].lower()
-        correct_option = ""
-        if correct_letter in question_data['options']:
-            correct_option = question_data['options'][correct_letter]
+        correct_letter = question_data.correct_answer.lower()
+        correct_option = question_data.option_text(correct_letter) or ""
 
         answer_text = f"✅ CORRECT ANSWER: {correct_letter.upper()}\n"
         if correct_option:
             answer_text += f"{correct_option}\n\n"
-        answer_text += f"💡 EXPLANATION:\n{question_data['feedback']}"
+        answer_text += f"💡 EXPLANATION:\n{question_data.feedback}"
 
         self.flash_answer_text.insert(1.0, answer_text)
         self.flash_answer_text.config(state=tk.DISABLED)
@@ -1094,6 +3426,9 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         self.nav_frame.pack(pady=10)
 
         # Update navigation button states
+        if self.spaced_review:
+            self.next_flash_button.config(state=tk.NORMAL)
+            return
         self.prev_flash_button.config(state=tk.NORMAL if self.current_flash_index > 0 else tk.DISABLED)
         self.next_flash_button.config(
             state=tk.NORMAL if self.current_flash_index < len(self.current_flash_cards) - 1 else tk.DISABLED)
@@ -1108,7 +3443,10 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         self.reveal_button.pack(pady=10)
 
     def try_again_flash_card(self):
-        """Hide the answer to try again"""
+        """Hide the answer to try again; in a spaced review, bring the card back shortly"""
+        if self.spaced_review:
+            self.grade_flash_card(REVIEW_AGAIN)
+            return
         self.answer_revealed = False
         self.hide_answer()
 
@@ -1120,7 +3458,10 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
             self.display_flash_card()
 
     def next_flash_card(self):
-        """Go to next flash card"""
+        """Go to next flash card; in a spaced review, schedule this one further out"""
+        if self.spaced_review:
+            self.grade_flash_card(REVIEW_GOOD)
+            return
         if self.current_flash_index < len(self.current_flash_cards) - 1:
             self.current_flash_index += 1
             self.answer_revealed = False
@@ -1144,6 +3485,8 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
 
     def on_answer_selected(self, *args):
         """Handle real-time feedback when user selects an answer"""
+        if self.suppress_answer_trace:
+            return
         if not self.current_questions or self.current_question_index >= len(self.current_questions):
             return
 
@@ -1151,32 +3494,63 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         if not selected_answer:
             return
 
-        current_question = self.current_questions[self.current_question_index]
-        correct_answer = current_question['correct_answer']
-        question_id = current_question['number']
+        index = self.current_question_index
+        current_question = self.current_questions[index]
+        correct_answer = current_question.correct_answer
 
-        # Check if this question was already answered
-        was_answered_before = question_id in self.user_answers
-
-        # Save the answer
-        self.user_answers[question_id] = selected_answer
+        # Journal and count new or changed answers (clicking the selected option again changes nothing)
+        previous_answer = self.answer_at(index)
+        if previous_answer != selected_answer:
+            was_correct = previous_answer == correct_answer if previous_answer else None
+            try:
+                self.answer_journal.record_answer(self.question_id(current_question), selected_answer,
+                                                  selected_answer == correct_answer, was_correct)
+            except Exception as e:
+                persistence_log.error("Error recording answer: %s", e)
+            self.record_answer(index, selected_answer)
 
         # Provide immediate feedback
-        if selected_answer == correct_answer:
-            self.feedback_label.config(text="✅ CORRECT! Well done!",
-                                       fg='#27ae60')
-            if not was_answered_before:
-                self.correct_count += 1
-        else:
-            self.feedback_label.config(text=f"❌ INCORRECT. The correct answer is {correct_answer.upper()}.",
-                                       fg='#e74c3c')
-
-        # Update total answered count if this is a new answer
-        if not was_answered_before:
-            self.total_answered += 1
+        self.show_answer_feedback(selected_answer, correct_answer)
 
         # Update real-time score
         self.update_score_display()
+        self.update_navigator_cell(self.current_question_index)
+
+    def answer_at(self, index) -> str:
+        """The answer given to the question at index in this session, or an empty string"""
+        code = self.answers[index]
+        return chr(code) if code else ""
+
+    def record_answer(self, index, answer):
+        """Store an answer and keep the correct/answered counters and incorrect positions current"""
+        previous = self.answer_at(index)
+        correct_answer = self.current_questions[index].correct_answer
+        if previous == correct_answer:
+            self.correct_count -= 1
+        elif not previous:
+            self.total_answered += 1
+
+        self.answers[index] = ord(answer)
+        if answer == correct_answer:
+            self.correct_count += 1
+            self.incorrect_positions.discard(index)
+        else:
+            self.incorrect_positions.add(index)
+
+    def positions_with_status(self, status) -> List[int]:
+        """Positions in current_questions that are 'correct', 'incorrect' or 'unanswered', in order"""
+        if status == 'incorrect':
+            return sorted(self.incorrect_positions)
+        if status == 'unanswered':
+            # bytearray.find scans in C, so this costs one step per unanswered question
+            positions = []
+            index = self.answers.find(0)
+            while index != -1:
+                positions.append(index)
+                index = self.answers.find(0, index + 1)
+            return positions
+        return [index for index, code in enumerate(self.answers)
+                if code and index not in self.incorrect_positions]
 
     def update_score_display(self):
         """Update the real-time score display"""
@@ -1191,69 +3565,209 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
             self.score_label.config(text="Score: 0/0 (0.0%) | Status: Not Started", fg='#f39c12')
 
     def start_timer(self):
-        """Start and update the timer"""
-
-        def update_timer():
-            if hasattr(self, 'start_time') and self.start_time:
-                elapsed = int(time.time() - self.start_time)
-                minutes = elapsed // 60
-                seconds = elapsed % 60
-                self.timer_label.config(text=f"Time: {minutes:02d}:{seconds:02d}")
-                self.root.after(1000, update_timer)
+        """Start the test timer, replacing any timer of a previous test"""
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = self.scheduler.every(1000, self.update_timer, screen='test')
+
+    def update_timer(self):
+        """Show the time spent on the test; stops once there is no test running"""
+        if not self.start_time:
+            return False
+        elapsed = int(time.monotonic() - self.start_time)
+        minutes = elapsed // 60
+        seconds = elapsed % 60
+        self.timer_label.config(text=f"Time: {minutes:02d}:{seconds:02d}")
+
+    def update_widget(self, key, widget, **options):
+        """widget.config(**options), skipped when the widget already shows exactly these options
+
+        Every change to a test screen widget tracked here must go through this
+        method, or the cached state would no longer match the widget.
+        """
+        if self.rendered.get(key) != options:
+            widget.config(**options)
+            self.rendered[key] = options
+
+    def set_answer_var(self, value):
+        """Select an option without running on_answer_selected (which is only for user clicks)"""
+        if self.answer_var.get() != value:
+            self.suppress_answer_trace = True
+            try:
+                self.answer_var.set(value)
+            finally:
+                self.suppress_answer_trace = False
 
-        update_timer()
+    def show_answer_feedback(self, selected_answer, correct_answer):
+        """Show whether the selected answer is correct"""
+        if selected_answer == correct_answer:
+            self.update_widget('feedback', self.feedback_label, text="✅ CORRECT! Well done!", fg='#27ae60')
+        else:
+            self.update_widget('feedback', self.feedback_label,
+                               text=f"❌ INCORRECT. The correct answer is {correct_answer.upper()}.", fg='#e74c3c')
 
     def display_question(self):
-        """Display the current question"""
+        """Display the current question, touching only the widgets whose content changes"""
         if not self.current_questions or self.current_question_index >= len(self.current_questions):
             return
 
+        started = time.perf_counter()
         question_data = self.current_questions[self.current_question_index]
 
         # Update progress
         current_num = self.current_question_index + 1
         total_num = len(self.current_questions)
-        self.progress_label.config(text=f"Question {current_num} of {total_num}")
-        self.progress_bar.config(value=current_num)
+        self.update_widget('progress', self.progress_label, text=f"Question {current_num} of {total_num}")
+        self.update_widget('progress_bar', self.progress_bar, value=current_num)
 
         # Display question text
-        self.question_text.config(state=tk.NORMAL)
-        self.question_text.delete(1.0, tk.END)
-        question_title = f"Question {question_data['number']}: "
-        self.question_text.insert(1.0, question_title + question_data['question'])
-
-        # Highlight question number
-        self.question_text.tag_add("title", "1.0", f"1.{len(question_title)}")
-        self.question_text.tag_config("title", font=('Arial', 11, 'bold'), foreground='#2c3e50')
-        self.question_text.config(state=tk.DISABLED)
+        question_title = f"Question {question_data.number}: "
+        if self.rendered.get('question_text') != (question_title, question_data.question):
+            self.question_text.config(state=tk.NORMAL)
+            self.question_text.delete(1.0, tk.END)
+            self.question_text.insert(1.0, question_title + question_data.question)
 
-        # Clear any existing selection first
-        self.answer_var.set("")
+            # Highlight question number
+            self.question_text.tag_add("title", "1.0", f"1.{len(question_title)}")
+            self.question_text.config(state=tk.DISABLED)
+            self.rendered['question_text'] = (question_title, question_data.question)
 
         # Display options
         for letter, button in self.option_buttons.items():
-            if letter in question_data['options']:
-                option_text = f"{letter.upper()}. {question_data['options'][letter]}"
-                button.config(text=option_text, state=tk.NORMAL)
+            option_text = question_data.option_text(letter)
+            if option_text is not None:
+                self.update_widget(('option', letter), button, text=f"{letter.upper()}. {option_text}",
+                                   state=tk.NORMAL)
             else:
-                button.config(text="", state=tk.DISABLED)
-
-        # Force update to ensure radio buttons display correctly
-        self.root.update_idletasks()
+                self.update_widget(('option', letter), button, text="", state=tk.DISABLED)
 
-        # Set current answer if exists (after clearing and updating)
-        question_id = question_data['number']
-        if question_id in self.user_answers:
-            self.answer_var.set(self.user_answers[question_id])
-            # Show feedback for already answered questions
-            self.on_answer_selected()
+        # Show the saved answer, and its feedback, for already answered questions
+        selected_answer = self.answer_at(self.current_question_index)
+        self.set_answer_var(selected_answer)
+        if selected_answer:
+            self.show_answer_feedback(selected_answer, question_data.correct_answer)
         else:
-            self.feedback_label.config(text="")
+            self.update_widget('feedback', self.feedback_label, text="")
 
         # Update button states
-        self.prev_button.config(state=tk.NORMAL if self.current_question_index > 0 else tk.DISABLED)
-        self.next_button.config(
-            state=tk.NORMAL if self.current_question_index < len(self.current_questions) - 1 else tk.DISABLED)
+        self.update_widget('prev', self.prev_button,
+                           state=tk.NORMAL if self.current_question_index > 0 else tk.DISABLED)
+        self.update_widget('next', self.next_button,
+                           state=tk.NORMAL if self.current_question_index < total_num - 1 else tk.DISABLED)
+        flagged = self.current_question_index in self.flagged_questions
+        self.update_widget('flag', self.flag_button, text="🏳️ Unflag" if flagged else "🚩 Flag")
+        self.set_navigator_current(self.current_question_index)
+
+        # Idle callbacks run after Tk has redrawn, so the latency includes the paint
+        self.root.after_idle(self.record_render_latency, started)
+
+    def record_render_latency(self, started):
+        """Keep per-question render times and log a summary every RENDER_REPORT_INTERVAL renders"""
+        self.render_latencies.append((time.perf_counter() - started) * 1000)
+        self.renders += 1
+        if self.renders % RENDER_REPORT_INTERVAL == 0 and ui_log.isEnabledFor(logging.DEBUG):
+            latencies = sorted(self.render_latencies)
+            ui_log.debug("Question render latency over the last %d renders: p50 %.1f ms, p95 %.1f ms, max %.1f ms",
+                         len(latencies), latencies[len(latencies) // 2],
+                         latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)], latencies[-1])
+
+    def reset_navigator(self):
+        """Size the navigator grid for the current questions and draw its visible cells"""
+        canvas = self.navigator_canvas
+        canvas.delete('all')
+        self.navigator_cells = {}
+        self.navigator_current = None
+        rows = math.ceil(len(self.current_questions) / NAVIGATOR_COLUMNS)
+        canvas.configure(scrollregion=(0, 0, NAVIGATOR_COLUMNS * NAVIGATOR_CELL, rows * NAVIGATOR_CELL))
+        canvas.yview_moveto(0)
+        self.cull_navigator()
+
+    def navigator_cell_style(self, index):
+        """Canvas options for the rectangle of the question at index"""
+        if not self.answers[index]:
+            status = 'unanswered'
+        elif index in self.incorrect_positions:
+            status = 'incorrect'
+        else:
+            status = 'correct'
+
+        if index == self.navigator_current:
+            outline, width = NAVIGATOR_COLORS['current'], 3
+        elif index in self.flagged_questions:
+            outline, width = NAVIGATOR_COLORS['flagged'], 3
+        else:
+            outline, width = '#95a5a6', 1
+        return {'fill': NAVIGATOR_COLORS[status], 'outline': outline, 'width': width}
+
+    def cull_navigator(self):
+        """Keep canvas items only for the navigator cells inside the visible rows"""
+        canvas = self.navigator_canvas
+        top = canvas.canvasy(0)
+        top_row = max(0, int(top // NAVIGATOR_CELL))
+        bottom_row = int((top + canvas.winfo_height()) // NAVIGATOR_CELL)
+        first = top_row * NAVIGATOR_COLUMNS
+        last = min(len(self.current_questions), (bottom_row + 1) * NAVIGATOR_COLUMNS)
+
+        for index in [index for index in self.navigator_cells if not first <= index < last]:
+            for item in self.navigator_cells.pop(index):
+                canvas.delete(item)
+
+        for index in range(first, last):
+            if index in self.navigator_cells:
+                continue
+            row, column = divmod(index, NAVIGATOR_COLUMNS)
+            x, y = column * NAVIGATOR_CELL, row * NAVIGATOR_CELL
+            rectangle = canvas.create_rectangle(x + 2, y + 2, x + NAVIGATOR_CELL - 2, y + NAVIGATOR_CELL - 2,
+                                                **self.navigator_cell_style(index))
+            label = canvas.create_text(x + NAVIGATOR_CELL / 2, y + NAVIGATOR_CELL / 2, text=str(index + 1),
+                                       font=('Arial', 7), fill='#2c3e50')
+            self.navigator_cells[index] = (rectangle, label)
+
+    def update_navigator_cell(self, index):
+        """Recolor one navigator cell, if it is currently drawn"""
+        cell = self.navigator_cells.get(index)
+        if cell is not None:
+            self.navigator_canvas.itemconfig(cell[0], **self.navigator_cell_style(index))
+
+    def set_navigator_current(self, index):
+        """Move the current-question outline to index and scroll its row into view"""
+        previous = self.navigator_current
+        if previous == index:
+            return
+        self.navigator_current = index
+        if previous is not None:
+            self.update_navigator_cell(previous)
+        self.update_navigator_cell(index)
+
+        canvas = self.navigator_canvas
+        rows = math.ceil(len(self.current_questions) / NAVIGATOR_COLUMNS)
+        row_top = (index // NAVIGATOR_COLUMNS) * NAVIGATOR_CELL
+        top = canvas.canvasy(0)
+        if row_top < top or row_top + NAVIGATOR_CELL > top + canvas.winfo_height():
+            canvas.yview_moveto(max(0, row_top - NAVIGATOR_CELL) / (rows * NAVIGATOR_CELL))
+
+    def on_navigator_scroll(self, first, last):
+        """Move the scrollbar and draw the cells that scrolled into view"""
+        self.navigator_scrollbar.set(first, last)
+        self.cull_navigator()
+
+    def on_navigator_click(self, event):
+        """Go to the question whose cell was clicked"""
+        column = int(self.navigator_canvas.canvasx(event.x) // NAVIGATOR_CELL)
+        index = int(self.navigator_canvas.canvasy(event.y) // NAVIGATOR_CELL) * NAVIGATOR_COLUMNS + column
+        if 0 <= column < NAVIGATOR_COLUMNS and 0 <= index < len(self.current_questions):
+            self.current_question_index = index
+            self.display_question()
+
+    def toggle_flag(self):
+        """Flag the current question for another look, or clear its flag"""
+        index = self.current_question_index
+        if index in self.flagged_questions:
+            self.flagged_questions.discard(index)
+        else:
+            self.flagged_questions.add(index)
+        self.update_widget('flag', self.flag_button,
+                           text="🏳️ Unflag" if index in self.flagged_questions else "🚩 Flag")
+        self.update_navigator_cell(index)
 
     def previous_question(self):
         """Go to previous question"""
@@ -1303,25 +3817,12 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
 
     def calculate_final_results(self):
         """Calculate final test results - FIXED VERSION"""
-        # Clear previous wrong questions for fresh calculation
-        self.wrong_questions = []
-        final_correct = 0
-
-        print(f"DEBUG: Calculating results for {len(self.current_questions)} questions")  # Debug line
-
-        for question in self.current_questions:
-            question_id = question['number']
-            user_answer = self.user_answers.get(question_id, "")
+        # The running counters already hold the score; only the wrong and unanswered questions are visited
+        final_correct = self.correct_count
+        wrong_positions = sorted(self.incorrect_positions.union(self.positions_with_status('unanswered')))
+        self.wrong_questions = self.current_questions.subset(wrong_positions)
 
-            print(f"DEBUG: Q{question_id}: User={user_answer}, Correct={question['correct_answer']}")  # Debug line
-
-            if user_answer == question['correct_answer']:
-                final_correct += 1
-            else:
-                # Add to wrong questions - this question was answered incorrectly
-                self.wrong_questions.append(question)
-
-        print(f"DEBUG: Final correct: {final_correct}, Wrong questions: {len(self.wrong_questions)}")  # Debug line
+        engine_log.debug("Final correct: %d, wrong questions: %d", final_correct, len(self.wrong_questions))
 
         # Save wrong questions for future sessions
         self.save_progress_data()
@@ -1330,35 +3831,17 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         percentage = (final_correct / total_questions) * 100 if total_questions > 0 else 0
 
         # Calculate time taken
-        time_taken = int(time.time() - self.start_time) if self.start_time else 0
+        time_taken = int(time.monotonic() - self.start_time) if self.start_time else 0
 
         self.show_results(final_correct, total_questions, percentage, time_taken)
 
     def show_results(self, correct_count: int, total_questions: int, percentage: float, time_taken: int):
         """Display final test results"""
-        # Clear test interface
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-        # Results container
-        results_container = tk.Frame(self.root, bg='#2c3e50')
-        results_container.pack(fill=tk.BOTH, expand=True)
-
-        # Header
-        header_frame = tk.Frame(results_container, bg='#34495e', relief=tk.RAISED, bd=3)
-        header_frame.pack(fill=tk.X, padx=20, pady=20)
+        started = time.perf_counter()
+        self.get_screen('results')
 
         test_type = "MINI TEST RESULTS" if self.is_mini_test else "FINAL TEST RESULTS"
-        header_label = tk.Label(header_frame,
-                                text=f"📊 {test_type}",
-                                font=('Arial', 20, 'bold'),
-                                fg='#ecf0f1',
-                                bg='#34495e')
-        header_label.pack(pady=15)
-
-        # Score display
-        score_frame = tk.Frame(results_container, bg='#2c3e50')
-        score_frame.pack(pady=20)
+        self.results_header_label.config(text=f"📊 {test_type}")
 
         # Determine grade and color
         if percentage >= 90:
@@ -1378,32 +3861,173 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
             grade_color = "#e74c3c"
             status = "NEEDS IMPROVEMENT"
 
+        # Main score, grade and status
+        self.results_score_label.config(text=f"{correct_count}/{total_questions} ({percentage:.1f}%)", fg=grade_color)
+        self.results_grade_label.config(text=f"Grade: {grade} - {status}", fg=grade_color)
+
+        # Time
+        minutes = time_taken // 60
+        seconds = time_taken % 60
+        self.results_time_label.config(text=f"⏱️ Time: {minutes:02d}:{seconds:02d}")
+
+        # Summary, built as a list of lines and joined once
+        if self.is_mini_test:
+            test_type = 'Mini Test (Wrong Answers Only)'
+        elif self.custom_exam:
+            test_type = f'Custom Exam (seed {self.custom_exam[1]})'
+        else:
+            test_type = 'Full Practice Test'
+        summary = [
+            "📈 TEST SUMMARY",
+            "=" * 50,
+            "",
+            f"📝 Test Type: {test_type}",
+            f"✅ Correct Answers: {correct_count}",
+            f"❌ Incorrect Answers: {total_questions - correct_count}",
+            f"📊 Percentage: {percentage:.1f}%",
+            f"🎯 Grade: {grade}",
+            f"⏱️ Time Taken: {minutes:02d}:{seconds:02d}",
+            "",
+        ]
+        if self.wrong_questions:
+            summary.append(f"📚 {len(self.wrong_questions)} questions to review below")
+        else:
+            summary.append("🎉 PERFECT SCORE! You answered all questions correctly!")
+
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(1.0, "\n".join(summary))
+        self.results_text.config(state=tk.DISABLED)
+
+        # Review list: counts come from the running counters; rows are rendered as they scroll into view
+        self.review_questions = self.current_questions
+        counts = {'correct': correct_count,
+                  'incorrect': len(self.incorrect_positions),
+                  'unanswered': total_questions - self.total_answered}
+        for key, label, statuses in RESULTS_FILTERS:
+            self.review_filter_buttons[key].config(text=f"{label} ({sum(counts[s] for s in statuses)})")
+        self.review_filter.set('review')
+        self.apply_review_filter()
+
+        # Mini test buttons (only if there are wrong answers and not already in mini test)
+        self.results_mini_test_button.pack_forget()
+        self.results_mini_flash_button.pack_forget()
+        if self.wrong_questions and not self.is_mini_test:
+            self.results_mini_test_button.config(
+                text=f"🔄 TAKE MINI TEST ({len(self.wrong_questions)} Questions)")
+            self.results_mini_test_button.pack(side=tk.LEFT, padx=10, before=self.restart_button)
+            self.results_mini_flash_button.config(
+                text=f"📚 MINI FLASH CARDS ({len(self.wrong_questions)} Questions)")
+            self.results_mini_flash_button.pack(side=tk.LEFT, padx=10, before=self.restart_button)
+
+        if self.is_mini_test:
+            restart_text = "🔄 RETAKE MINI TEST"
+        elif self.custom_exam:
+            restart_text = "🔄 RETAKE CUSTOM EXAM"
+        else:
+            restart_text = "🔄 RETAKE FULL TEST"
+        self.restart_button.config(text=restart_text)
+        self.show_screen('results', started)
+
+    def apply_review_filter(self):
+        """Restart the review list with the questions matching the selected filter"""
+        statuses = next(statuses for key, _, statuses in RESULTS_FILTERS if key == self.review_filter.get())
+        if len(statuses) == 3:
+            self.review_rows = range(len(self.review_questions))
+        else:
+            self.review_rows = sorted(index for status in statuses for index in self.positions_with_status(status))
+        self.review_rendered = 0
+        self.review_page_pending = False
+
+        self.review_text.config(state=tk.NORMAL)
+        self.review_text.delete(1.0, tk.END)
+        if not self.review_rows:
+            self.review_text.insert(tk.END, "No questions match this filter.\n")
+        self.review_text.config(state=tk.DISABLED)
+        self.review_text.yview_moveto(0)
+        self.render_review_page()
+
+    def format_review_entry(self, position: int, index: int) -> str:
+        """The question at index of the finished test as entry number position of the review list"""
+        question = self.review_questions[index]
+        user_answer = self.answer_at(index)
+        text = question.question
+        feedback = question.feedback
+        return "\n".join((
+            f"{position}. Question {question.number}:",
+            f"   ❓ {text[:150]}{'...' if len(text) > 150 else ''}",
+            f"   👤 Your Answer: {user_answer.upper() if user_answer else 'No answer'}",
+            f"   ✅ Correct Answer: {question.correct_answer.upper()}",
+            f"   💡 Explanation: {feedback[:200]}{'...' if len(feedback) > 200 else ''}",
+            "",
+            "",
+        ))
+
+    def render_review_page(self):
+        """Append the next RESULTS_PAGE_SIZE questions of the filtered review list"""
+        self.review_page_pending = False
+        start = self.review_rendered
+        end = min(start + RESULTS_PAGE_SIZE, len(self.review_rows))
+        if start < end:
+            page = "".join(self.format_review_entry(position + 1, self.review_rows[position])
+                           for position in range(start, end))
+            self.review_text.config(state=tk.NORMAL)
+            self.review_text.insert(tk.END, page)
+            self.review_text.config(state=tk.DISABLED)
+            self.review_rendered = end
+        self.review_status_label.config(text=f"Showing {self.review_rendered} of {len(self.review_rows)}")
+
+    def on_review_scroll(self, first, last):
+        """Move the scrollbar, and queue the next page once the user nears the end of what is rendered"""
+        self.review_scrollbar.set(first, last)
+        if (float(last) > 0.9 and self.review_rendered < len(self.review_rows)
+                and not self.review_page_pending):
+            self.review_page_pending = True
+            self.root.after_idle(self.render_review_page)
+
+    def build_results_screen(self):
+        """Build the results screen once; show_results fills in the data"""
+        from tkinter import scrolledtext
+
+        # Results container
+        results_container = tk.Frame(self.root, bg='#2c3e50')
+
+        # Header
+        header_frame = tk.Frame(results_container, bg='#34495e', relief=tk.RAISED, bd=3)
+        header_frame.pack(fill=tk.X, padx=20, pady=20)
+
+        self.results_header_label = tk.Label(header_frame,
+                                             text="",
+                                             font=('Arial', 20, 'bold'),
+                                             fg='#ecf0f1',
+                                             bg='#34495e')
+        self.results_header_label.pack(pady=15)
+
+        # Score display
+        score_frame = tk.Frame(results_container, bg='#2c3e50')
+        score_frame.pack(pady=20)
+
         # Main score
-        score_text = f"{correct_count}/{total_questions} ({percentage:.1f}%)"
-        score_label = tk.Label(score_frame,
-                               text=score_text,
-                               font=('Arial', 24, 'bold'),
-                               fg=grade_color,
-                               bg='#2c3e50')
-        score_label.pack()
+        self.results_score_label = tk.Label(score_frame,
+                                            text="",
+                                            font=('Arial', 24, 'bold'),
+                                            bg='#2c3e50')
+        self.results_score_label.pack()
 
         # Grade and status
-        grade_label = tk.Label(score_frame,
-                               text=f"Grade: {grade} - {status}",
-                               font=('Arial', 16, 'bold'),
-                               fg=grade_color,
-                               bg='#2c3e50')
-        grade_label.pack(pady=5)
+        self.results_grade_label = tk.Label(score_frame,
+                                            text="",
+                                            font=('Arial', 16, 'bold'),
+                                            bg='#2c3e50')
+        self.results_grade_label.pack(pady=5)
 
         # Time
-        minutes = time_taken // 60
-        seconds = time_taken % 60
-        time_label = tk.Label(score_frame,
-                              text=f"⏱️ Time: {minutes:02d}:{seconds:02d}",
-                              font=('Arial', 12),
-                              fg='#bdc3c7',
-                              bg='#2c3e50')
-        time_label.pack(pady=5)
+        self.results_time_label = tk.Label(score_frame,
+                                           text="",
+                                           font=('Arial', 12),
+                                           fg='#bdc3c7',
+                                           bg='#2c3e50')
+        self.results_time_label.pack(pady=5)
 
         # Details frame
         details_frame = tk.LabelFrame(results_container,
@@ -1413,79 +4037,89 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                       fg='#ecf0f1')
         details_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
 
-        self.results_text = scrolledtext.ScrolledText(details_frame,
-                                                      height=15,
-                                                      font=('Arial', 10),
-                                                      wrap=tk.WORD,
-                                                      bg='#ecf0f1')
-        self.results_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-        # Populate results text
-        results_content = f"📈 TEST SUMMARY\n"
-        results_content += "=" * 50 + "\n\n"
-        results_content += f"📝 Test Type: {'Mini Test (Wrong Answers Only)' if self.is_mini_test else 'Full Practice Test'}\n"
-        results_content += f"✅ Correct Answers: {correct_count}\n"
-        results_content += f"❌ Incorrect Answers: {total_questions - correct_count}\n"
-        results_content += f"📊 Percentage: {percentage:.1f}%\n"
-        results_content += f"🎯 Grade: {grade}\n"
-        results_content += f"⏱️ Time Taken: {minutes:02d}:{seconds:02d}\n\n"
-
-        if self.wrong_questions:
-            results_content += f"📚 QUESTIONS TO REVIEW ({len(self.wrong_questions)}):\n"
-            results_content += "=" * 50 + "\n\n"
-
-            for i, question in enumerate(self.wrong_questions, 1):
-                question_id = question['number']
-                user_answer = self.user_answers.get(question_id, "No answer")
-                results_content += f"{i}. Question {question_id}:\n"
-                results_content += f"   ❓ {question['question'][:150]}{'...' if len(question['question']) > 150 else ''}\n"
-                results_content += f"   👤 Your Answer: {user_answer.upper() if user_answer != 'No answer' else user_answer}\n"
-                results_content += f"   ✅ Correct Answer: {question['correct_answer'].upper()}\n"
-                results_content += f"   💡 Explanation: {question['feedback'][:200]}{'...' if len(question['feedback']) > 200 else ''}\n\n"
-        else:
-            results_content += "🎉 PERFECT SCORE! You answered all questions correctly!\n"
-
-        self.results_text.insert(1.0, results_content)
-        self.results_text.config(state=tk.DISABLED)
+        self.results_text = tk.Text(details_frame,
+                                    height=11,
+                                    font=('Arial', 10),
+                                    wrap=tk.WORD,
+                                    bg='#ecf0f1')
+        self.results_text.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        # Review filters
+        filter_frame = tk.Frame(details_frame, bg='#2c3e50')
+        filter_frame.pack(fill=tk.X, padx=10)
+
+        self.review_filter = tk.StringVar(value='review')
+        self.review_filter_buttons = {}
+        for key, label, _ in RESULTS_FILTERS:
+            button = tk.Radiobutton(filter_frame,
+                                    text=label,
+                                    variable=self.review_filter,
+                                    value=key,
+                                    command=self.apply_review_filter,
+                                    indicatoron=False,
+                                    font=('Arial', 10),
+                                    bg='#34495e',
+                                    fg='#ecf0f1',
+                                    selectcolor='#3498db',
+                                    padx=8,
+                                    pady=2)
+            button.pack(side=tk.LEFT, padx=2)
+            self.review_filter_buttons[key] = button
+
+        self.review_status_label = tk.Label(filter_frame,
+                                            text="",
+                                            font=('Arial', 10),
+                                            fg='#bdc3c7',
+                                            bg='#2c3e50')
+        self.review_status_label.pack(side=tk.RIGHT)
+
+        # Review list; pages are appended as the user scrolls towards the end
+        self.review_text = scrolledtext.ScrolledText(details_frame,
+                                                     height=15,
+                                                     font=('Arial', 10),
+                                                     wrap=tk.WORD,
+                                                     bg='#ecf0f1')
+        self.review_scrollbar = self.review_text.vbar
+        self.review_text.config(yscrollcommand=self.on_review_scroll)
+        self.review_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.review_rows = []
+        self.review_rendered = 0
+        self.review_page_pending = False
 
         # Buttons frame
         buttons_frame = tk.Frame(results_container, bg='#2c3e50')
         buttons_frame.pack(pady=20)
 
-        # Mini test button (only if there are wrong answers and not already in mini test)
-        if self.wrong_questions and not self.is_mini_test:
-            mini_test_button = tk.Button(buttons_frame,
-                                         text=f"🔄 TAKE MINI TEST ({len(self.wrong_questions)} Questions)",
-                                         font=('Arial', 12, 'bold'),
-                                         bg='#e74c3c',
-                                         fg='white',
-                                         padx=20,
-                                         pady=10,
-                                         command=self.start_mini_test)
-            mini_test_button.pack(side=tk.LEFT, padx=10)
-
-            # Mini flash cards button
-            mini_flash_button = tk.Button(buttons_frame,
-                                          text=f"📚 MINI FLASH CARDS ({len(self.wrong_questions)} Questions)",
-                                          font=('Arial', 12, 'bold'),
-                                          bg='#9b59b6',
-                                          fg='white',
-                                          padx=20,
-                                          pady=10,
-                                          command=self.start_mini_flash_cards)
-            mini_flash_button.pack(side=tk.LEFT, padx=10)
+        # Mini test button (packed by show_results if there are wrong answers and not already in mini test)
+        self.results_mini_test_button = tk.Button(buttons_frame,
+                                                  text="",
+                                                  font=('Arial', 12, 'bold'),
+                                                  bg='#e74c3c',
+                                                  fg='white',
+                                                  padx=20,
+                                                  pady=10,
+                                                  command=self.start_mini_test)
+
+        # Mini flash cards button
+        self.results_mini_flash_button = tk.Button(buttons_frame,
+                                                   text="",
+                                                   font=('Arial', 12, 'bold'),
+                                                   bg='#9b59b6',
+                                                   fg='white',
+                                                   padx=20,
+                                                   pady=10,
+                                                   command=self.start_mini_flash_cards)
 
         # Restart test button
-        restart_text = "🔄 RETAKE MINI TEST" if self.is_mini_test else "🔄 RETAKE FULL TEST"
-        restart_button = tk.Button(buttons_frame,
-                                   text=restart_text,
-                                   font=('Arial', 12),
-                                   bg='#3498db',
-                                   fg='white',
-                                   padx=20,
-                                   pady=10,
-                                   command=self.restart_current_test)
-        restart_button.pack(side=tk.LEFT, padx=10)
+        self.restart_button = tk.Button(buttons_frame,
+                                        text="",
+                                        font=('Arial', 12),
+                                        bg='#3498db',
+                                        fg='white',
+                                        padx=20,
+                                        pady=10,
+                                        command=self.restart_current_test)
+        self.restart_button.pack(side=tk.LEFT, padx=10)
 
         # Main menu button
         menu_button = tk.Button(buttons_frame,
@@ -1498,10 +4132,14 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
                                 command=self.create_main_menu)
         menu_button.pack(side=tk.LEFT, padx=10)
 
+        return results_container
+
     def restart_current_test(self):
-        """Restart the current test (full or mini)"""
+        """Restart the current test (full, mini or the same custom exam)"""
         if self.is_mini_test:
             self.start_mini_test()
+        elif self.custom_exam:
+            self.retake_custom_exam()
         else:
             self.start_full_test()
 
@@ -1510,6 +4148,7 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
         # Reset all modes
         self.flash_cards_mode = False
         self.is_mini_flash_cards = False
+        self.spaced_review = False
         self.answer_revealed = False
         self.create_main_menu()
 
@@ -1524,15 +4163,22 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
 
         if result:
             try:
-                # Remove saved files
-                if os.path.exists(self.test_data_file):
-                    os.remove(self.test_data_file)
-                if os.path.exists(self.progress_file):
-                    os.remove(self.progress_file)
+                # Let queued writes finish so none land after the files are removed
+                self.persistence_writer.flush()
+
+                # Remove saved files, the mapped bank first so a failure there leaves
+                # the rest intact
+                self.release_mapped_bank()
+                if os.path.exists(self.bank_file):
+                    os.remove(self.bank_file)
+                self.question_store.clear()
+                self.answer_journal.clear()
+                self.review_schedule.clear()
+                self.parse_cache.clear()
 
                 # Reset application state
                 self.all_questions = []
-                self.wrong_questions = []
+                self.wrong_questions = QuestionSetView([])
                 self.test_file_loaded = False
 
                 # Load default sample questions
@@ -1548,12 +4194,97 @@ Ready to test your real estate knowledge? Click "START FULL TEST" below!
             except Exception as e:
                 messagebox.showerror("Error", f"Error clearing saved data: {str(e)}")
 
+    def shutdown(self):
+        """Write everything still queued before the process exits"""
+        if not self.persistence_writer.flush(timeout=PERSIST_EXIT_TIMEOUT):
+            persistence_log.warning("Timed out writing saved data on exit")
+        self.persistence_writer.stop(timeout=PERSIST_EXIT_TIMEOUT)
+        self.answer_journal.close()
+        if persistence_log.isEnabledFor(logging.DEBUG):
+            persistence_log.debug("Persistence writer metrics: %s", self.persistence_writer.metrics())
+
+
+def measure_import_times(module: str = "TEST_PREP") -> Tuple[float, List[Tuple[float, float, str]]]:
+    """Import module in a fresh interpreter under -X importtime
+
+    Returns the module's cumulative import time in milliseconds and a
+    (self_ms, cumulative_ms, name) row for every module imported on the way.
+    """
+    import subprocess
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    rows = []
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        row = (int(self_us) / 1000, int(cumulative_us) / 1000, name.rstrip())
+        rows.append(row)
+        if name.strip() == module:
+            total_ms = row[1]
+    return total_ms, rows
+
+
+def import_audit(budget_ms: float = IMPORT_BUDGET_MS, runs: int = 5, top: int = 20) -> int:
+    """Print the slowest imports of the median of several cold imports
+
+    Returns a process exit status: 1 if the median import time is over budget_ms.
+    """
+    if getattr(sys, 'frozen', False):
+        print("The import audit needs a Python interpreter; run it from source with python TEST_PREP.py")
+        return 2
+
+    measurements = sorted((measure_import_times() for _ in range(runs)), key=lambda m: m[0])
+    total_ms, rows = measurements[len(measurements) // 2]
+
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    for self_ms, cumulative_ms, name in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"{self_ms:9.1f} {cumulative_ms:14.1f}  {name}")
+    print(f"\nimport TEST_PREP: {total_ms:.1f} ms (median of {runs} cold imports), budget {budget_ms:.0f} ms")
+
+    if total_ms > budget_ms:
+        print("Over budget - import the module that grew where it is used rather than at the top of the file")
+        return 1
+    return 0
+
 
 def main():
+    if "--import-audit" in sys.argv[1:]:
+        import argparse
+
+        parser = argparse.ArgumentParser(description="Report what a cold import of TEST_PREP spends its time on")
+        parser.add_argument("--import-audit", action="store_true", required=True)
+        parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                            help="fail if the median import takes longer (default: %(default)s)")
+        parser.add_argument("--runs", type=int, default=5, help="cold imports to measure (default: %(default)s)")
+        parser.add_argument("--top", type=int, default=20, help="slowest modules to list (default: %(default)s)")
+        args = parser.parse_args()
+        sys.exit(import_audit(args.budget_ms, args.runs, args.top))
+
+    log_spec = os.environ.get(LOG_LEVEL_ENV, "")
+    log_file = os.environ.get(LOG_FILE_ENV)
+    if log_spec or log_file:
+        try:
+            configure_logging(log_spec, log_file)
+        except (ValueError, OSError) as e:
+            print(f"Ignoring {LOG_LEVEL_ENV}/{LOG_FILE_ENV}: {e}", file=sys.stderr)
+
+    startup_timings = {'import': time.perf_counter() - STARTUP_STARTED}
+    tk_started = time.perf_counter()
     root = tk.Tk()
-    app = RealEstateTestApplication(root)
-    root.mainloop()
+    startup_timings['tk_init'] = time.perf_counter() - tk_started
+    app = RealEstateTestApplication(root, startup_timings)
+    try:
+        root.mainloop()
+    finally:
+        app.shutdown()
 
 
 if __name__ == "__main__":
+    # Needed for worker processes in the PyInstaller-built executable
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()  
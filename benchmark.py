@@ -0,0 +1,279 @@
+"""Headless benchmarks for the Real Estate Practice Test parser and persistence.
+
+Writes synthetic question banks in the exact upload format, then times
+parsing, save_test_data, load_saved_data (startup), reading the whole saved
+bank, fetching random questions from the startup view of the bank, holding
+the bank as dicts or as Question objects, journaling one answer per
+question, and drawing a miss-weighted custom exam at each bank size, and
+prints the results as JSON so runs can be compared across commits:
+
+    python benchmark.py --sizes 1000 10000 --repeat 5 --output bench.json
+
+Timings are collected without tracemalloc; peak memory comes from one extra
+run with tracemalloc enabled, since tracing slows everything down.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import TEST_PREP
+from TEST_PREP import (RealEstateTestApplication, AnswerJournal, MappedQuestionList, ParseCache, PersistenceWriter,
+                       Question, QuestionSetView, QuestionStore, ReviewSchedule, StoredQuestionList,
+                       iter_question_file, miss_rate_weights, weighted_sample)
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+SUBJECTS = ["The buyer", "The seller", "A licensee", "The broker", "The lender", "The appraiser",
+            "A tenant", "The landlord", "The county", "An escrow agent"]
+VERBS = ["must disclose", "may not accept", "is required to verify", "should record", "can transfer",
+         "is liable for", "must prorate", "may terminate"]
+OBJECTS = ["the earnest money deposit", "a deed restriction", "the property taxes", "the HOA fees",
+           "an easement appurtenant", "the listing agreement", "a lis pendens", "the title insurance",
+           "the closing statement", "a zoning variance", "the security deposit", "a quitclaim deed"]
+QUALIFIERS = ["before closing", "within three business days", "under state law", "in writing",
+              "at the time of listing", "unless waived by the buyer", "after the inspection period"]
+SHARED_OPTIONS = ["None of the above", "Either A or C", "Both A and B", "All of the above"]
+
+
+def synthetic_sentence(rng):
+    return (f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} "
+            f"{rng.choice(QUALIFIERS)}")
+
+
+def write_synthetic_bank(file_path, count, seed=0):
+    """Write count questions in the **Question N** / **Question text** / **Feedback** format"""
+    rng = random.Random(seed)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for number in range(1, count + 1):
+            options = [synthetic_sentence(rng) for _ in range(3)]
+            options.append(rng.choice(SHARED_OPTIONS))
+            rng.shuffle(options)
+            correct = rng.choice(options)
+
+            f.write(f"**Question {number}**\n\nCorrect\n\nMark 1.00 out of 1.00\n\n"
+                    f"**Question text**\n\nWhich of the following is true? {synthetic_sentence(rng)}?\n\n"
+                    f"Question {number}Answer\n\n")
+            for letter, option in zip('abcd', options):
+                f.write(f"{letter}.\n{option}\n\n")
+            f.write(f"**Feedback**\n\n{synthetic_sentence(rng)}. {synthetic_sentence(rng)}.\n\n"
+                    f"The correct answer is: {correct}\n\n")
+
+
+def synthetic_history(questions, seed):
+    """Answer history, as in AnswerJournal.stats, for every 20th question"""
+    rng = random.Random(seed)
+    history = {}
+    for question in questions[::20]:
+        attempts = rng.randint(1, 5)
+        history[question['id']] = [attempts, rng.randint(0, attempts), 0.0]
+    return history
+
+
+def headless_app(data_dir):
+    """An application instance whose persistence lives in data_dir, without a Tk window"""
+    app = RealEstateTestApplication.__new__(RealEstateTestApplication)
+    app.all_questions = []
+    app.wrong_questions = QuestionSetView([])
+    app.test_file_loaded = False
+    app.test_data_file = os.path.join(data_dir, "saved_test_data.json")
+    app.database_file = os.path.join(data_dir, "saved_test_data.db")
+    app.bank_file = os.path.join(data_dir, "saved_test_data.bank")
+    app.progress_file = os.path.join(data_dir, "saved_progress.json")
+    app.parse_cache = ParseCache(os.path.join(data_dir, "parse_cache"))
+    app.question_store = QuestionStore(app.database_file)
+    app.persistence_writer = PersistenceWriter(debounce=0)
+    app.answer_journal = AnswerJournal(os.path.join(data_dir, "saved_progress.journal"),
+                                       os.path.join(data_dir, "saved_progress_snapshot.json"))
+    app.review_schedule = ReviewSchedule(os.path.join(data_dir, "saved_review_schedule.json"))
+    return app
+
+
+def bench_parse(context):
+    list(iter_question_file(context['bank_path'], parallel=False))
+
+
+def bench_save_test_data(context):
+    context['app'].save_test_data()
+    context['app'].persistence_writer.flush()
+
+
+def release_bank(context):
+    context['app'].question_store.close()
+    if isinstance(context['view'], MappedQuestionList):
+        context['view'].close()
+
+
+def bench_load_saved_data(context):
+    release_bank(context)
+    context['app'].load_saved_data()
+    context['view'] = context['app'].all_questions
+
+
+def bench_load_all_questions(context):
+    context['app'].question_store.load_questions()
+
+
+def bench_random_access(context):
+    """Fetch 1000 random questions one at a time from the bank as loaded at startup"""
+    questions = context['view']
+    for index in context['access_order']:
+        questions[index]
+
+
+def bench_bank_as_dicts(context):
+    """Hold the whole bank as one dict per question, as the app did before Question"""
+    bank = [json.loads(record) for record in context['records']]
+    del bank
+
+
+def bench_bank_as_questions(context):
+    """Hold the whole bank as Question objects; compare its peak memory with bank_as_dicts"""
+    bank = [Question.from_dict(json.loads(record)) for record in context['records']]
+    del bank
+
+
+def bench_record_answers(context):
+    journal = context['app'].answer_journal
+    for index, question in enumerate(context['app'].all_questions):
+        journal.record_answer(question['id'], 'a', index % 4 == 0)
+    journal.close()
+
+
+def bench_sample_exam(context):
+    """Draw a 100-question custom exam weighted by miss rate from the saved bank, as start_custom_exam does"""
+    history = context['history']
+    positions = context['app'].question_store.positions_by_id(list(history))
+    weights = miss_rate_weights(context['count'], positions, history)
+    weighted_sample(weights, 100, seed=0)
+
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'save_test_data': bench_save_test_data,
+    'load_saved_data': bench_load_saved_data,
+    'load_all_questions': bench_load_all_questions,
+    'random_access': bench_random_access,
+    'bank_as_dicts': bench_bank_as_dicts,
+    'bank_as_questions': bench_bank_as_questions,
+    'record_answers': bench_record_answers,
+    'sample_exam': bench_sample_exam,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def measure(benchmark, context, repeat):
+    """Time repeat runs, then one more under tracemalloc for peak memory"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark(context)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        benchmark(context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    p50 = percentile(timings, 0.50)
+    return {
+        'p50_seconds': p50,
+        'p95_seconds': percentile(timings, 0.95),
+        'min_seconds': timings[0],
+        'questions_per_second': context['count'] / p50 if p50 else None,
+        'peak_memory_bytes': peak,
+        'runs': repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes, names, repeat, seed):
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parser_version': TEST_PREP.PARSER_VERSION,
+        'timestamp': time.time(),
+        'results': [],
+    }
+
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            bank_path = os.path.join(data_dir, f"bank_{count}.txt")
+            write_synthetic_bank(bank_path, count, seed)
+
+            rng = random.Random(seed)
+            app = headless_app(data_dir)
+            app.all_questions = [Question.from_dict(question)
+                                 for question in iter_question_file(bank_path, parallel=False)]
+            app.test_file_loaded = True
+            app.save_test_data()
+            app.persistence_writer.flush()
+
+            context = {
+                'count': count,
+                'bank_path': bank_path,
+                'bank_bytes': os.path.getsize(bank_path),
+                'app': app,
+                'view': app.open_mapped_bank() or StoredQuestionList(app.question_store),
+                'access_order': [rng.randrange(count) for _ in range(1000)],
+                'records': [json.dumps(question.to_dict()) for question in app.all_questions],
+                'history': synthetic_history(app.all_questions, seed),
+            }
+            for name in names:
+                print(f"Running {name} at {count} questions...", file=sys.stderr)
+                entry = {'benchmark': name, 'questions': count, 'bank_bytes': context['bank_bytes']}
+                entry.update(measure(BENCHMARKS[name], context, repeat))
+                results['results'].append(entry)
+            app.persistence_writer.stop()
+            release_bank(context)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="bank sizes in questions (default: %(default)s)")
+    parser.add_argument('--benchmarks', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per benchmark (default: 5)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the synthetic banks")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.benchmarks, args.repeat, args.seed)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()